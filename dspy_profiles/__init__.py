@@ -1,8 +1,10 @@
 """dspy-profiles package."""
 
 import importlib.metadata
+from typing import TYPE_CHECKING
 
-from .core import current_profile, profile, with_profile
+if TYPE_CHECKING:
+    from .core import current_profile, profile, with_profile
 
 try:
     __version__ = importlib.metadata.version("dspy-profiles")
@@ -11,3 +13,17 @@ except importlib.metadata.PackageNotFoundError:
 
 
 __all__ = ["profile", "with_profile", "current_profile", "__version__"]
+
+_CORE_EXPORTS = {"profile", "with_profile", "current_profile"}
+
+
+def __getattr__(name: str):
+    # `core` imports dspy, which is slow to import. Deferring it keeps the CLI (which
+    # only needs `__version__` from here) fast for commands that never activate a profile.
+    if name in _CORE_EXPORTS:
+        from . import core
+
+        value = getattr(core, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
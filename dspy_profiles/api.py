@@ -1,14 +1,12 @@
 """Core API for managing dspy-profiles."""
 
 from pathlib import Path
+import tomllib
 from typing import Any
 
 from dotenv import dotenv_values
-from pydantic import ValidationError
-import toml
 
 from dspy_profiles.config import ProfileManager, find_profiles_path
-from dspy_profiles.validation import ProfilesFile
 
 
 class ProfileNotFound(Exception):
@@ -27,6 +25,17 @@ class ProfileExistsError(Exception):
         super().__init__(f"Profile '{profile_name}' already exists.")
 
 
+def _set_nested(data: dict[str, Any], parts: tuple[str, ...], value: Any) -> None:
+    """Sets `value` in `data` at the nested location described by pre-split `parts`.
+
+    Intermediate dictionaries are created as needed.
+    """
+    current_level = data
+    for part in parts[:-1]:
+        current_level = current_level.setdefault(part, {})
+    current_level[parts[-1]] = value
+
+
 def list_profiles() -> dict[str, Any]:
     """Lists all available profiles.
 
@@ -90,12 +99,7 @@ def update_profile(
     if profile_data is None:
         profile_data = {}
 
-    keys = key.split(".")
-    current_level = profile_data
-    for k in keys[:-1]:
-        current_level = current_level.setdefault(k, {})
-
-    current_level[keys[-1]] = value
+    _set_nested(profile_data, tuple(key.split(".")), value)
 
     manager.set(profile_name, profile_data)
     return profile_data, None
@@ -132,17 +136,14 @@ def import_profile(profile_name: str, from_path: "Path") -> str | None:
 
     new_profile = {}
     for key, value in env_values.items():
-        if key.upper().startswith("DSPY_"):
-            parts = key.upper().split("_")[1:]
-            if len(parts) < 2:
+        key = key.lower()
+        if key.startswith("dspy_"):
+            # DSPY_<SECTION>_<KEY>: everything after the first separator is the config key
+            section, sep, config_key = key[5:].partition("_")
+            if not sep:
                 continue
 
-            section = parts[0].lower()
-            config_key = "_".join(parts[1:]).lower()
-
-            if section not in new_profile:
-                new_profile[section] = {}
-            new_profile[section][config_key] = value
+            _set_nested(new_profile, (section, config_key), value)
 
     if not new_profile:
         return f"No variables with the 'DSPY_' prefix found in '{from_path}'."
@@ -160,10 +161,23 @@ def validate_profiles_file(config_path: Path) -> Exception | None:
     Returns:
         An exception object if validation fails, otherwise None.
     """
-    try:
-        with open(config_path) as f:
-            data = toml.load(f)
-        ProfilesFile.model_validate(data)
+    config_path = Path(config_path)
+    if not config_path.is_file():
+        return FileNotFoundError(f"No such file: '{config_path}'")
+    content = config_path.read_bytes()
+    if not content:
         return None
-    except (FileNotFoundError, toml.TomlDecodeError, ValidationError) as e:
+
+    from pydantic import ValidationError
+
+    from dspy_profiles.validation import PROFILES_ADAPTER
+
+    try:
+        data = tomllib.loads(content.decode("utf-8", errors="replace"))
+    except tomllib.TOMLDecodeError as e:
         return e
+    try:
+        PROFILES_ADAPTER.validate_python(data)
+    except ValidationError as e:
+        return e
+    return None
@@ -4,7 +4,6 @@ from difflib import unified_diff
 import json
 from typing import Annotated
 
-from pydantic import HttpUrl
 from rich.console import Console
 from rich.text import Text
 import typer
@@ -30,6 +29,8 @@ def diff_profiles(
         raise typer.Exit(code=1)
 
     def http_url_serializer(obj):
+        from pydantic import HttpUrl
+
         if isinstance(obj, HttpUrl):
             return str(obj)
         raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
@@ -1,6 +1,7 @@
 """CLI command for running a command with a profile."""
 
 import os
+from pathlib import PureWindowsPath
 import subprocess
 import sys
 from typing import Annotated
@@ -18,26 +19,26 @@ app = typer.Typer(
 )
 
 
+_PYTHON_EXECUTABLES = frozenset({"python", "python.exe"})
+
+
+def _is_python_command(executable: str) -> bool:
+    """Whether `executable` is a Python interpreter or a Python script."""
+    # `PureWindowsPath` splits on both `/` and `\\`, so this handles either platform's paths
+    name = PureWindowsPath(executable.lower()).name
+    return name in _PYTHON_EXECUTABLES or name.endswith(".py")
+
+
+def _execute(command: list[str], env: dict[str, str]) -> subprocess.CompletedProcess[str]:
+    """Runs `command` in a child process with `env`, capturing its output as text."""
+    return subprocess.run(command, env=env, check=False, capture_output=True, text=True)
+
+
 def _execute_with_profile(command: list[str], profile_name: str):
     """Core logic to execute a command with an activated profile."""
 
-    is_python_command = False
-    if command:
-        executable = command[0].lower()
-        if (
-            executable == "python"
-            or executable.endswith("/python")
-            or executable.endswith("\\python.exe")
-            or executable.endswith(".py")
-        ):
-            is_python_command = True
-
-    if is_python_command:
-        script_path_index = -1
-        for i, arg in enumerate(command):
-            if arg.endswith(".py"):
-                script_path_index = i
-                break
+    if command and _is_python_command(command[0]):
+        script_path_index = next((i for i, arg in enumerate(command) if arg.endswith(".py")), -1)
 
         if script_path_index != -1:
             script_path = command[script_path_index]
@@ -61,7 +62,7 @@ with activate_profile('{profile_name}'):
     env["DSPY_PROFILE"] = profile_name
 
     try:
-        result = subprocess.run(command, env=env, check=False, capture_output=True, text=True)
+        result = _execute(command, env=env)
         if result.stdout:
             console.print(result.stdout, end="")
         if result.stderr:
@@ -6,7 +6,6 @@ from rich.console import Console
 import typer
 
 from dspy_profiles.config import ProfileManager, find_profiles_path
-from dspy_profiles.core import profile as activate_profile
 
 console = Console()
 
@@ -23,6 +22,9 @@ def test_profile(
 
     console.print(f"Testing profile: [bold cyan]{profile_name}[/bold cyan]...")
 
+    # Imported here because it pulls in dspy, which the not-found path above doesn't need
+    from dspy_profiles.core import profile as activate_profile
+
     try:
         with activate_profile(profile_name):
             import dspy
@@ -3,7 +3,6 @@
 from pathlib import Path
 from typing import Annotated
 
-from pydantic import ValidationError
 from rich.console import Console
 import typer
 
@@ -32,6 +31,8 @@ def validate_profiles(
     console.print(f"Validating profiles at: [cyan]{config_path}[/cyan]")
     error = api.validate_profiles_file(config_path)
     if error:
+        from pydantic import ValidationError
+
         if isinstance(error, ValidationError):
             console.print(
                 f"[bold red]❌ Validation Failed:[/] Found {error.error_count()} error(s)."
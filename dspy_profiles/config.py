@@ -1,12 +1,10 @@
+import functools
 import os
 from pathlib import Path
+import tomllib
 from typing import Any
 
-from pydantic import ValidationError
-import toml
-
-from dspy_profiles.utils import normalize_config
-from dspy_profiles.validation import ProfilesFile
+from dspy_profiles.utils import copy_config, normalize_config
 
 CONFIG_DIR = Path.home() / ".dspy"
 """The default directory for storing dspy-profiles configuration."""
@@ -14,7 +12,9 @@ CONFIG_DIR = Path.home() / ".dspy"
 PROFILES_PATH = CONFIG_DIR / "profiles.toml"
 """The default path to the profiles configuration file."""
 
-_manager = None
+_writes = 0
+"""Count of profiles-file writes made by this process; part of `_file_version` so
+same-mtime rewrites still invalidate the caches."""
 
 
 def find_profiles_path() -> Path:
@@ -40,10 +40,63 @@ def find_profiles_path() -> Path:
             return local_path
 
     # 3. Fallback to global default
-    print(f"{PROFILES_PATH=}")
     return PROFILES_PATH
 
 
+def _file_version(path: Path) -> tuple[int, int, int] | None:
+    """Returns a key that changes whenever the file at `path` is modified.
+
+    Besides the file's modification time and size, the key counts the profiles files
+    written by this process, so a rewrite that lands within the filesystem's timestamp
+    resolution is still noticed.
+
+    Args:
+        path (Path): The path to the `profiles.toml` file.
+
+    Returns:
+        tuple[int, int, int] | None: The file's version, or None if it doesn't exist.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, _writes
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(path: str, version: tuple[int, int, int]) -> dict[str, Any]:
+    """Parses, normalizes and validates a profiles file.
+
+    The file's version is part of the cache key, so any write to the file results in
+    a fresh parse. Callers must not mutate the returned dict.
+
+    Args:
+        path (str): The path to the `profiles.toml` file.
+        version (tuple[int, int, int]): The file's version, see `_file_version`.
+
+    Returns:
+        dict[str, Any]: The loaded profiles, or an empty dictionary if the file is
+        empty or invalid.
+    """
+    # pydantic is only needed once a file is actually parsed, so commands that never
+    # read profiles (and `--help`) don't import it
+    from pydantic import ValidationError
+
+    from dspy_profiles.validation import PROFILES_ADAPTER
+
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        if not data:
+            return {}
+
+        normalized_data = normalize_config(data)
+        PROFILES_ADAPTER.validate_python(normalized_data)
+        return normalized_data
+    except (tomllib.TOMLDecodeError, ValidationError):
+        return {}
+
+
 class ProfileManager:
     """Manages loading, saving, and updating profiles from a TOML file.
 
@@ -65,6 +118,9 @@ class ProfileManager:
 
     def _ensure_file_exists(self):
         """Ensures the profiles file and its parent directory exist."""
+        # Touching an existing file would bump its mtime and invalidate the load caches
+        if self.path.exists():
+            return
         self.path.parent.mkdir(exist_ok=True, parents=True)
         self.path.touch(exist_ok=True)
 
@@ -75,19 +131,10 @@ class ProfileManager:
             dict[str, Any]: A dictionary of the loaded profiles. Returns an empty
             dictionary if the file is empty, invalid, or not found.
         """
-        if not self.path.is_file():
+        if not self.path.is_file() or (version := _file_version(self.path)) is None:
             return {}
-        with self.path.open("r") as f:
-            try:
-                data = toml.load(f)
-                if not data:
-                    return {}
-
-                normalized_data = normalize_config(data)
-                ProfilesFile.model_validate(normalized_data)
-                return normalized_data
-            except (toml.TomlDecodeError, ValidationError):
-                return {}
+        # Hand out a copy so that callers can modify the result without touching the cache
+        return copy_config(_load_cached(str(self.path), version))
 
     def save(self, profiles: dict[str, Any]):
         """Saves a dictionary of profiles to the TOML file.
@@ -95,8 +142,14 @@ class ProfileManager:
         Args:
             profiles (dict[str, Any]): The dictionary of profiles to save.
         """
+        # Parsing goes through the stdlib `tomllib`; the `toml` package is only needed
+        # for writing, so read-only commands never import it.
+        import toml
+
+        global _writes
         with self.path.open("w") as f:
             toml.dump(profiles, f)
+        _writes += 1
 
     def get(self, profile_name: str) -> dict[str, Any] | None:
         """Retrieves a specific profile by name.
@@ -119,9 +172,39 @@ class ProfileManager:
             config (dict[str, Any]): The configuration dictionary for the profile.
         """
         profiles = self.load()
+        # A new profile only adds tables, so it can be appended instead of rewriting the
+        # whole file. An empty `profiles` may also mean the file is invalid, in which case
+        # it is replaced as before.
+        if profiles and profile_name not in profiles and "." not in profile_name:
+            self._append({profile_name: config})
+            return
         profiles[profile_name] = config
         self.save(profiles)
 
+    def _append(self, profiles: dict[str, Any]):
+        """Appends profiles that are not yet defined to the end of the TOML file.
+
+        Args:
+            profiles (dict[str, Any]): The dictionary of new profiles to append.
+        """
+        import toml
+
+        global _writes
+        with self.path.open("a") as f:
+            f.write("\n" + toml.dumps(profiles))
+        _writes += 1
+
+    def bulk_set(self, profiles: dict[str, dict[str, Any]]):
+        """Saves or updates several profiles with a single read and write of the file.
+
+        Args:
+            profiles (dict[str, dict[str, Any]]): The configuration dictionaries to
+                save, keyed by profile name.
+        """
+        all_profiles = self.load()
+        all_profiles.update(profiles)
+        self.save(all_profiles)
+
     def delete(self, profile_name: str) -> bool:
         """Deletes a profile by name.
 
@@ -1,132 +1,238 @@
-from collections.abc import Callable, Generator
-import contextlib
-from contextvars import ContextVar
-from functools import wraps
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from contextvars import ContextVar, Token
+from functools import cache, wraps
 import inspect
 import os
+from types import TracebackType
 from typing import Any
 
 import dspy
 
-from dspy_profiles.loader import ProfileLoader, ResolvedProfile
+from dspy_profiles.config import CONFIG_DIR
+from dspy_profiles.loader import ProfileLoader, ResolvedProfile, _deep_merge
+
+_CACHE_ROOT = os.path.join(CONFIG_DIR, "cache")
+"""The directory under which each profile gets its own default dspy cache directory."""
 
 _CURRENT_PROFILE: ContextVar[ResolvedProfile | None] = ContextVar("current_profile", default=None)
+# Bound once, as `current_profile()` may be called for every prediction in a module's forward()
+_get_current_profile = _CURRENT_PROFILE.get
 
+_ACTIVATIONS: ContextVar[tuple[tuple[Token, AbstractContextManager] | None, ...]] = ContextVar(
+    "profile_activations", default=()
+)
+"""The states of the `profile()` blocks entered in the current thread or async task.
 
-def _deep_merge(parent: dict, child: dict) -> dict:
-    """Recursively merges two dictionaries, with child values overriding parent values."""
-    merged = parent.copy()
-    for key, value in child.items():
-        if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-            merged[key] = _deep_merge(merged[key], value)
-        else:
-            merged[key] = value
-    return merged
+`with` blocks exit in the reverse order they were entered within one context, so the
+innermost state is always last. Keeping the stack here rather than on the context
+manager lets a single `profile()` object be shared across threads and tasks.
+"""
 
 
-@contextlib.contextmanager
-def profile(
-    profile_name: str | None = None,
-    *,
-    force: bool = False,
-    config_path: str | None = None,
-    **overrides: Any,
-) -> Generator[None, None, None]:
-    """A context manager to temporarily apply a dspy-profiles configuration.
+@cache
+def _rm_class(provider: str) -> type:
+    """Looks up a retrieval model class on `dspy` by name, falling back to `ColBERTv2`."""
+    # Fallback for legacy dspy versions might be needed if RM names change.
+    return getattr(dspy, provider, None) or dspy.ColBERTv2
 
-    This context manager activates a specified profile, configuring `dspy.settings`
-    with the language model (LM), retrieval model (RM), and other settings defined
-    in the profile. It also handles profile precedence and allows for inline overrides.
 
-    Args:
-        profile_name (str | None, optional): The name of the profile to activate. If not
-            provided, it falls back to the `DSPY_PROFILE` environment variable, and then
-            to "default". Defaults to None.
-        force (bool, optional): If True, this profile will override any profile set via
-            the `DSPY_PROFILE` environment variable. Defaults to False.
-        config_path (str | None, optional): Path to the `profiles.toml` file. If None,
-            uses the default search paths. Defaults to None.
-        **overrides: Keyword arguments to override profile settings (e.g., `lm`, `rm`).
-            These are deeply merged into the loaded profile's configuration.
+def _activate(
+    profile_name: str | None,
+    force: bool,
+    config_path: str | None,
+    overrides: dict[str, Any],
+) -> tuple[Token, AbstractContextManager] | None:
+    """Activates a profile and returns the state needed to deactivate it again.
 
-    Yields:
-        None: The context manager does not yield a value.
-
-    Example:
-        ```python
-        with dspy_profiles.profile("my-profile", lm={"temperature": 0.7}):
-            # DSPy calls within this block will use 'my-profile' with overridden temperature.
-            response = dspy.Predict("question -> answer")("What is DSPy?")
-        ```
+    Returns:
+        tuple[Token, AbstractContextManager] | None: The `current_profile` token and the
+        entered `dspy.context`, or None if there was no profile to activate.
     """
-    env_profile = os.getenv("DSPY_PROFILE")
-    profile_to_load = profile_name if force or not env_profile else env_profile or "default"
+    # The environment is read once per activation, and not at all when forced.
+    profile_to_load = profile_name if force else os.environ.get("DSPY_PROFILE") or profile_name
 
     if not profile_to_load:
-        yield
-        return
+        return None
 
     loader = ProfileLoader(config_path=config_path) if config_path else ProfileLoader()
     loaded_profile = loader.get_config(profile_to_load)
-    # print(f"DEBUG: Loaded profile config: {loaded_profile.config}")
-    print(f"[DEBUG] Initial loaded_profile.config: {loaded_profile.config}")
-    print(f"[DEBUG] Overrides received: {overrides}")
     final_config = _deep_merge(loaded_profile.config, overrides)
-    print(f"[DEBUG] final_config after merge: {final_config}")
+    # Profile-aware caching setup
+    settings = final_config.setdefault("settings", {})
+    if "cache_dir" not in settings:
+        settings["cache_dir"] = os.path.join(_CACHE_ROOT, loaded_profile.name)
+
     resolved_profile = ResolvedProfile(
         name=loaded_profile.name,
         config=final_config,
         lm=final_config.get("lm"),
         rm=final_config.get("rm"),
-        settings=final_config.get("settings"),
+        settings=settings,
     )
 
-    # Profile-aware caching setup
-    settings = final_config.setdefault("settings", {})
-    if "cache_dir" not in settings:
-        settings["cache_dir"] = os.path.expanduser(f"~/.dspy/cache/{loaded_profile.name}")
-
     lm_instance, rm_instance = None, None
     if resolved_profile.lm:
-        print(f"[DEBUG] resolved_profile.lm is type: {type(resolved_profile.lm)}")
         if isinstance(resolved_profile.lm, dspy.LM):
-            print("[DEBUG] resolved_profile.lm is a dspy.LM instance. Using it directly.")
             lm_instance = resolved_profile.lm
         else:
-            print("[DEBUG] resolved_profile.lm is a dict. Instantiating new LM.")
             lm_config = resolved_profile.lm.copy()
             model = lm_config.pop("model", None)
             provider = lm_config.pop("provider", "openai").capitalize()
             lm_class = getattr(dspy, provider, dspy.LM)
             lm_instance = lm_class(model=model, **lm_config) if model else dspy.LM(**lm_config)
-        print(f"[DEBUG] lm_instance created: {lm_instance}")
 
     if resolved_profile.rm:
         rm_config = resolved_profile.rm.copy()
-        provider = rm_config.pop("provider", "ColBERTv2")
-        # Fallback for legacy dspy versions might be needed if RM names change.
-        rm_class = getattr(dspy, provider, dspy.ColBERTv2)
+        rm_class = _rm_class(rm_config.pop("provider", "ColBERTv2"))
         rm_instance = rm_class(**rm_config)
 
     token = _CURRENT_PROFILE.set(resolved_profile)
     try:
-        # print(
-        #     f"DEBUG: Configuring dspy.context with lm={lm_instance},"
-        #     f"rm={rm_instance}, settings={settings}"
-        # )
-        dspy_settings = settings.copy()
-        if resolved_profile.lm and isinstance(resolved_profile.lm, dict):
-            dspy_settings.update(resolved_profile.lm)
-
-        dspy.settings.configure(**dspy_settings)
-
-        print(f"[DEBUG] Entering dspy.context with lm_instance: {lm_instance}")
-        with dspy.context(lm=lm_instance, rm=rm_instance, **settings):
-            yield
+        # Everything is applied through one scoped `dspy.context`, which dspy keeps per
+        # thread and async task, instead of also configuring the global `dspy.settings`.
+        dspy_context = dspy.context(lm=lm_instance, rm=rm_instance, **settings)
+        dspy_context.__enter__()
+    except BaseException:
+        _CURRENT_PROFILE.reset(token)
+        raise
+    return token, dspy_context
+
+
+def _deactivate(
+    state: tuple[Token, AbstractContextManager] | None,
+    exc_type: type[BaseException] | None,
+    exc: BaseException | None,
+    tb: TracebackType | None,
+) -> None:
+    """Undoes an activation made by `_activate`, given the state it returned."""
+    if state is None:
+        return
+    token, dspy_context = state
+    try:
+        dspy_context.__exit__(exc_type, exc, tb)
     finally:
         _CURRENT_PROFILE.reset(token)
 
 
+def _call_in_profile(
+    func: Callable,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    profile_name: str | None,
+    force: bool,
+    config_path: str | None,
+    overrides: dict[str, Any],
+) -> Any:
+    """Calls `func` with the given profile active, deactivating it afterwards.
+
+    The activation state stays local to this call, so concurrent and recursive calls
+    don't share it with each other or with `with` blocks on a `profile()` object.
+    """
+    state = _activate(profile_name, force, config_path, overrides)
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        _deactivate(state, type(e), e, e.__traceback__)
+        raise
+    _deactivate(state, None, None, None)
+    return result
+
+
+class _ProfileContext:
+    """The context manager returned by `profile()`, which also works as a decorator.
+
+    Written as a plain class rather than with `contextlib.contextmanager` so entering
+    and leaving a profile doesn't pay for a generator and its wrapper on every use.
+    Activation state is kept in `_ACTIVATIONS`, never on the instance, so the same
+    object can be re-entered and used from several threads or tasks at once.
+    """
+
+    __slots__ = ("profile_name", "force", "config_path", "overrides")
+
+    def __init__(
+        self,
+        profile_name: str | None,
+        force: bool,
+        config_path: str | None,
+        overrides: dict[str, Any],
+    ):
+        self.profile_name = profile_name
+        self.force = force
+        self.config_path = config_path
+        self.overrides = overrides
+
+    def __enter__(self) -> None:
+        state = _activate(self.profile_name, self.force, self.config_path, self.overrides)
+        _ACTIVATIONS.set((*_ACTIVATIONS.get(), state))
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        *outer, state = _ACTIVATIONS.get()
+        _ACTIVATIONS.set(tuple(outer))
+        _deactivate(state, exc_type, exc, tb)
+
+    def __call__(self, func: Callable) -> Callable:
+        """Wraps `func` so that the profile is active for the duration of each call."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return _call_in_profile(
+                func,
+                args,
+                kwargs,
+                self.profile_name,
+                self.force,
+                self.config_path,
+                self.overrides,
+            )
+
+        return wrapper
+
+
+def profile(
+    profile_name: str | None = None,
+    *,
+    force: bool = False,
+    config_path: str | None = None,
+    **overrides: Any,
+) -> _ProfileContext:
+    """A context manager to temporarily apply a dspy-profiles configuration.
+
+    This context manager activates a specified profile, configuring `dspy.settings`
+    with the language model (LM), retrieval model (RM), and other settings defined
+    in the profile. It also handles profile precedence and allows for inline overrides.
+
+    Args:
+        profile_name (str | None, optional): The name of the profile to activate. If not
+            provided, it falls back to the `DSPY_PROFILE` environment variable, and then
+            to "default". Defaults to None.
+        force (bool, optional): If True, this profile will override any profile set via
+            the `DSPY_PROFILE` environment variable. Defaults to False.
+        config_path (str | None, optional): Path to the `profiles.toml` file. If None,
+            uses the default search paths. Defaults to None.
+        **overrides: Keyword arguments to override profile settings (e.g., `lm`, `rm`).
+            These are deeply merged into the loaded profile's configuration.
+
+    Returns:
+        A context manager that activates the profile on entry and restores the previous
+        configuration on exit. It does not bind a value with `as`. It can also be used
+        as a function decorator, activating the profile for each call.
+
+    Example:
+        ```python
+        with dspy_profiles.profile("my-profile", lm={"temperature": 0.7}):
+            # DSPy calls within this block will use 'my-profile' with overridden temperature.
+            response = dspy.Predict("question -> answer")("What is DSPy?")
+        ```
+    """
+    return _ProfileContext(profile_name, force, config_path, overrides)
+
+
 def with_profile(
     profile_name: str, *, force: bool = False, config_path: str | None = None, **overrides: Any
 ) -> Callable:
@@ -174,16 +280,21 @@ def with_profile(
         def profile_wrapper(func_to_wrap: Callable) -> Callable:
             @wraps(func_to_wrap)
             def wrapper(*args, **kwargs):
-                final_overrides = overrides.copy()
                 profile_keys = {"lm", "rm", "settings"}
                 func_overrides = {k: v for k, v in kwargs.items() if k in profile_keys}
                 func_args = {k: v for k, v in kwargs.items() if k not in profile_keys}
 
-                if func_overrides:
-                    final_overrides = _deep_merge(final_overrides, func_overrides)
-
-                with profile(profile_name, force=force, config_path=config_path, **final_overrides):
-                    return func_to_wrap(*args, **func_args)
+                # Activate directly rather than through `profile()`, so no context manager
+                # object is built per call.
+                return _call_in_profile(
+                    func_to_wrap,
+                    args,
+                    func_args,
+                    profile_name,
+                    force,
+                    config_path,
+                    _deep_merge(overrides, func_overrides) if func_overrides else overrides,
+                )
 
             return wrapper
 
@@ -209,12 +320,32 @@ def current_profile() -> ResolvedProfile | None:
     Returns:
         ResolvedProfile | None: The active ResolvedProfile, or None if no profile is active.
     """
-    return _CURRENT_PROFILE.get()
+    return _get_current_profile()
 
 
 _LM_CACHE: dict[tuple, dspy.LM] = {}
 
 
+def _freeze(value: Any) -> Any:
+    """Converts nested dicts and lists into hashable, order-independent tuples.
+
+    Each container is tagged with its type, so that e.g. a dict and a list of its
+    items don't freeze to the same value.
+    """
+    if isinstance(value, dict):
+        return dict, tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple):
+        return type(value), tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return set, frozenset(value)
+    return value
+
+
+def _lm_cache_key(profile_name: str, overrides: dict[str, Any]) -> tuple:
+    """Builds the `_LM_CACHE` key for a profile name and its LM overrides."""
+    return (profile_name, _freeze(overrides))
+
+
 def lm(profile_name: str, cached: bool = True, **overrides: Any) -> dspy.LM | None:
     """Gets a pre-configured `dspy.LM` instance for a given profile.
 
@@ -233,51 +364,26 @@ def lm(profile_name: str, cached: bool = True, **overrides: Any) -> dspy.LM | No
         dspy.LM | None: A configured `dspy.LM` instance, or None if the profile
             has no language model configured.
     """
-    print(f"\n[DEBUG] lm(profile_name='{profile_name}', cached={cached}, overrides={overrides})")
-
     # Separate LM-specific overrides from other function kwargs like 'config_path'
     known_non_lm_kwargs = {"config_path"}
     lm_overrides = {k: v for k, v in overrides.items() if k not in known_non_lm_kwargs}
-    print(f"[DEBUG] Separated lm_overrides: {lm_overrides}")
 
-    cache_key = (profile_name, tuple(sorted(lm_overrides.items())))
-    print(f"[DEBUG] Generated cache_key: {cache_key}")
-    if cached and cache_key in _LM_CACHE:
-        print(f"[DEBUG] Cache hit. Returning cached instance for key: {cache_key}")
-        return _LM_CACHE[cache_key]
-    print("[DEBUG] Cache miss. Proceeding to create new LM instance.")
+    cache_key = _lm_cache_key(profile_name, lm_overrides)
+    if cached and (instance := _LM_CACHE.get(cache_key)) is not None:
+        return instance
 
     loader = ProfileLoader()
     loaded_profile = loader.get_config(profile_name)
-    print(f"[DEBUG] Loaded profile '{loaded_profile.name}' with config: {loaded_profile.config}")
-    final_config = loaded_profile.config.copy()
-
-    if lm_overrides:
-        print("[DEBUG] Overrides detected. Merging lm_overrides into config...")
-        lm_config_before_merge = final_config.get("lm", {}).copy()
-        print(f"[DEBUG] lm_config before merge: {lm_config_before_merge}")
-        lm_config = final_config.setdefault("lm", {})
-        final_config["lm"] = _deep_merge(lm_config, lm_overrides)
-        print(f"[DEBUG] lm_config after merge: {final_config.get('lm')}")
-
-    lm_config = final_config.get("lm")
+
+    # Only the LM table is needed, so the rest of the profile is never copied
+    lm_config = _deep_merge(loaded_profile.lm or {}, lm_overrides)
     if not lm_config:
-        print("[DEBUG] No lm_config found after processing. Returning None.")
         return None
-    print(f"[DEBUG] Final lm_config to be used for instantiation: {lm_config}")
 
-    lm_config = lm_config.copy()
     model = lm_config.pop("model", None)
     provider = lm_config.pop("provider", "openai").capitalize()
     lm_class = getattr(dspy, provider, dspy.LM)
-    print(
-        f"[DEBUG] Preparing to instantiate lm_class '{lm_class.__name__}' "
-        f"with model='{model}' and kwargs={lm_config}"
-    )
-
     instance = lm_class(model=model, **lm_config)
-    print(f"[DEBUG] Instantiated LM: {instance}")
-    print(f"[DEBUG] Instantiated LM kwargs: {getattr(instance, 'kwargs', 'N/A')}")
 
     if cached:
         _LM_CACHE[cache_key] = instance
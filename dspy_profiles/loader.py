@@ -1,14 +1,37 @@
 from dataclasses import dataclass, field
+import functools
 import os
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 
-from dspy_profiles.config import PROFILES_PATH, ProfileManager
+from dspy_profiles.config import PROFILES_PATH, ProfileManager, _file_version
+from dspy_profiles.utils import copy_config
 
 
-@dataclass
+def _deep_merge(parent: dict, child: dict) -> dict:
+    """Merges two dictionaries, with child values overriding parent values.
+
+    Nested dictionaries present on both sides are merged as well. This walks an explicit
+    worklist instead of recursing, so each nested level costs one new dict and no extra
+    stack frame. Neither input is modified.
+    """
+    merged = parent.copy()
+    stack = [(merged, child)]
+    while stack:
+        out, overrides = stack.pop()
+        for key, value in overrides.items():
+            current = out.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                out[key] = nested = current.copy()
+                stack.append((nested, value))
+            else:
+                out[key] = value
+    return merged
+
+
+@dataclass(slots=True)
 class ResolvedProfile:
     """A dataclass holding the fully resolved and merged profile configuration.
 
@@ -56,24 +79,22 @@ class ProfileLoader:
         """Loads environment variables from a .env file if present."""
         load_dotenv()
 
-    def _deep_merge(self, parent: dict, child: dict) -> dict:
-        """Recursively merges two dictionaries. Child values override parent values."""
-        merged = parent.copy()
-        for key, value in child.items():
-            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                merged[key] = self._deep_merge(merged[key], value)
-            else:
-                merged[key] = value
-        return merged
-
     def _load_profile_config(
         self, profile_name: str, all_profiles: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Loads and recursively merges the specified profile from the config."""
         if all_profiles is None:
+            if (version := _file_version(self.config_path)) is not None:
+                # Hand out a copy so that callers can modify it without touching the cache
+                return copy_config(_resolve_cached(self.config_path, version, profile_name))
             manager = ProfileManager(self.config_path)
             all_profiles = manager.load()
 
+        return self._resolve(profile_name, all_profiles)
+
+    @staticmethod
+    def _resolve(profile_name: str, all_profiles: dict[str, Any]) -> dict[str, Any]:
+        """Recursively merges the specified profile with the profiles it extends."""
         if profile_name not in all_profiles:
             if profile_name == "default":
                 return {}  # It's okay if the default profile doesn't exist
@@ -86,14 +107,12 @@ class ProfileLoader:
             if parent_name == profile_name:
                 raise ValueError(f"Profile '{profile_name}' cannot extend itself.")
 
-            parent_config = self._load_profile_config(parent_name, all_profiles)
+            parent_config = ProfileLoader._resolve(parent_name, all_profiles)
 
-            # Create copies to avoid modifying the original loaded profiles
-            merged_config = parent_config.copy()
-            child_config = profile_data.copy()
-            child_config.pop("extends", None)  # Remove extends from child before merging
+            # _deep_merge copies what it changes, so the loaded profiles are left untouched
+            child_config = {k: v for k, v in profile_data.items() if k != "extends"}
 
-            return self._deep_merge(merged_config, child_config)
+            return _deep_merge(parent_config, child_config)
 
         return profile_data
 
@@ -122,3 +141,16 @@ class ProfileLoader:
             rm=profile_config.get("rm"),
             settings=profile_config.get("settings"),
         )
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_cached(
+    config_path: Path, version: tuple[int, int, int], profile_name: str
+) -> dict[str, Any]:
+    """Resolves a profile's inheritance chain, memoized on the profiles file's version.
+
+    Failed resolutions (missing profiles, circular `extends`) raise and are not cached.
+    Callers must not mutate the returned dict.
+    """
+    all_profiles = ProfileManager(config_path).load()
+    return ProfileLoader._resolve(profile_name, all_profiles)
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import Any
 
 
@@ -9,29 +8,66 @@ def normalize_config(config: dict[str, Any]) -> dict[str, Any]:
     This function is designed to handle TOML configurations where nested
     structures might be represented with dotted keys. For example, a key
     'lm.model' would be transformed into a nested dictionary
-    {'lm': {'model': ...}}.
+    {'lm': {'model': ...}}. Nested dictionaries are normalized as well, and
+    dictionaries that end up under the same key are merged regardless of their order.
 
     Args:
         config: The dictionary to normalize.
 
     Returns:
         A new dictionary with dotted keys expanded into nested structures.
+
+    Raises:
+        ValueError: If a key holds a dictionary in one entry and another value in
+            another, e.g. both 'lm' = 'x' and 'lm.model' = 'y'.
     """
-    normalized = defaultdict(dict)
-    for key, value in config.items():
-        if "." in key:
-            parts = key.split(".", 1)
-            # This is a simplified implementation that assumes one level of nesting
-            # which is sufficient for the current use case (e.g., 'lm.model').
-            # A more complex recursive solution would be needed for deeper nesting.
-            parent_key, child_key = parts
-            if parent_key not in normalized:
-                normalized[parent_key] = {}
-            normalized[parent_key][child_key] = value
-        else:
-            # If the value is a dictionary, it could be a sub-profile that also needs normalization
+    normalized: dict[str, Any] = {}
+    # Each item is a source dictionary and the output dictionary its entries go into
+    stack = [(config, normalized)]
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            node = target
+            leaf = key
+            # `tomllib` already nests unquoted dotted keys, so most keys skip the split
+            if "." in key:
+                *parents, leaf = key.split(".")
+                for part in parents:
+                    node = _child_dict(node, part)
             if isinstance(value, dict):
-                normalized[key] = normalize_config(value)
+                stack.append((value, _child_dict(node, leaf)))
+            elif isinstance(node.get(leaf), dict):
+                raise ValueError(f"Key '{leaf}' is set to both a table and a value.")
             else:
-                normalized[key] = value
-    return dict(normalized)
+                node[leaf] = value
+    return normalized
+
+
+def _child_dict(node: dict[str, Any], key: str) -> dict[str, Any]:
+    """Returns the dictionary stored under `key` in `node`, creating it if missing."""
+    child = node.get(key)
+    if child is None:
+        child = node[key] = {}
+    elif not isinstance(child, dict):
+        raise ValueError(f"Key '{key}' is set to both a table and a value.")
+    return child
+
+
+def copy_config(config: Any) -> Any:
+    """
+    Copy a configuration loaded from TOML, recursing into dictionaries and lists.
+
+    TOML only produces dictionaries, lists and immutable scalars, so this gives the
+    same result as `copy.deepcopy` at a fraction of the cost.
+
+    Args:
+        config: The configuration (or a value inside it) to copy.
+
+    Returns:
+        A copy that shares no mutable containers with the original.
+    """
+    if isinstance(config, dict):
+        return {key: copy_config(value) for key, value in config.items()}
+    if isinstance(config, list):
+        return [copy_config(value) for value in config]
+    return config
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, Field, RootModel
+from pydantic import BaseModel, ConfigDict, Field, RootModel, TypeAdapter
 
 
 class LanguageModelSettings(BaseModel):
@@ -65,3 +65,10 @@ class ProfilesFile(RootModel):
     """
 
     root: dict[str, Profile]
+
+
+PROFILES_ADAPTER: TypeAdapter[dict[str, Profile]] = TypeAdapter(dict[str, Profile])
+"""Validates a whole profiles file like `ProfilesFile`, without building a root model.
+
+Built once at import, so validating a file only runs the compiled schema.
+"""
@@ -1,10 +1,24 @@
 import copy
-from unittest.mock import patch
+import os
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock
 
+import click
+from click.testing import CliRunner as ClickCliRunner
+from click.testing import Result
 import dspy
 from dspy.dsp.utils.settings import DEFAULT_CONFIG
 from dspy.utils.dummies import DummyLM
 import pytest
+import typer
+from typer.testing import CliRunner
+
+from dspy_profiles import cli
+from dspy_profiles.commands import run as run_command
+from dspy_profiles.config import ProfileManager
+from dspy_profiles.core import _LM_CACHE, _rm_class
+from dspy_profiles.loader import _resolve_cached
 
 # Sample profiles for testing, now globally available
 MOCK_PROFILES = {
@@ -36,16 +50,210 @@ MOCK_PROFILES = {
     "no_lm_profile": {"rm": {"url": "http://some-rm-url"}},
 }
 
+# The inheritance hierarchy from `MOCK_PROFILES`, made schema-valid so it can be written to disk
+COMPOSITION_PROFILES = {
+    "base": MOCK_PROFILES["base"],
+    "child": {
+        **MOCK_PROFILES["child"],
+        "rm": {"model": "colbertv2.0", "url": "http://child_rm_url"},
+    },
+    "grandchild": MOCK_PROFILES["grandchild"],
+    "circular": MOCK_PROFILES["circular"],
+}
+
+# Profile files that the `config_path` fixture can write to disk, keyed by seed name.
+# They are kept as raw TOML so that no serializer runs in the test scaffold.
+SEEDS = {
+    "default": b"""\
+[default.lm]
+model = "gpt-4"
+
+[testing.lm]
+model = "gpt-3.5-turbo"
+""",
+}
+
+# Snapshot of dspy's defaults, taken once instead of deep-copying after every test.
+# The read-only view guards against anything mutating the shared snapshot.
+_PRISTINE_DEFAULT = MappingProxyType(copy.deepcopy(DEFAULT_CONFIG))
+
+# Public attribute names of `ProfileManager`, computed once so that spec'd mocks don't
+# re-introspect the class for every test.
+_PROFILE_MANAGER_SPEC = [
+    *(name for name in dir(ProfileManager) if not name.startswith("_")),
+    "path",
+]
+
+
+class FakeRun:
+    """A recording stand-in for the run command's `_execute`.
+
+    Every call returns the same `result` sentinel; tests that care about captured
+    output set `result.stdout`/`result.stderr` before invoking the command.
+    """
+
+    def __init__(self, returncode: int = 0, exc: type[Exception] | None = None):
+        self.calls = []
+        self.exc = exc
+        self.result = SimpleNamespace(returncode=returncode, stdout="", stderr="")
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.exc:
+            raise self.exc
+        return self.result
+
+
+class CachedCliRunner(CliRunner):
+    """A `CliRunner` that converts each Typer app to a Click command only once.
+
+    Typer's runner rebuilds the whole Click command tree on every `invoke`. The
+    tests patch the command modules' collaborators rather than the commands
+    themselves, so the built tree can safely be reused across tests.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._commands: dict[typer.Typer, click.Command] = {}
+
+    def invoke(self, app: typer.Typer, *args, **kwargs) -> Result:
+        if app not in self._commands:
+            self._commands[app] = typer.main.get_command(app)
+        return ClickCliRunner.invoke(self, self._commands[app], *args, **kwargs)
+
+
+@pytest.fixture
+def fake_run(monkeypatch) -> FakeRun:
+    """Installs a `FakeRun` as the run command's executor and returns it for configuration."""
+    fake = FakeRun()
+    monkeypatch.setattr(run_command, "_execute", fake)
+    return fake
+
+
+@pytest.fixture
+def mock_command_api(monkeypatch):
+    """Returns a factory that swaps a CLI command module's `api` for a `MagicMock`."""
+
+    def install(command: str) -> MagicMock:
+        mock_api = MagicMock()
+        monkeypatch.setattr(f"dspy_profiles.commands.{command}.api", mock_api)
+        return mock_api
+
+    return install
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_profiles_path(tmp_path_factory):
+    """Points `DSPY_PROFILES_PATH` at a per-worker file for the whole session.
+
+    Without this, anything that falls through to `find_profiles_path()` would read
+    (or create) the developer's real `~/.dspy/profiles.toml`, and parallel workers
+    would all share it.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    path = tmp_path_factory.mktemp(f"profiles-{worker}") / "profiles.toml"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DSPY_PROFILES_PATH", str(path))
+        yield path
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _unset_active_profile():
+    """Removes a `DSPY_PROFILE` set in the developer's shell for the whole session.
+
+    It takes precedence over the profile names the tests ask for. Tests that need it
+    set it themselves through `monkeypatch` or `manage_env_var`.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("DSPY_PROFILE", raising=False)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _skip_dotenv():
+    """Stops `ProfileLoader` from searching for and loading `.env` files.
+
+    The search walks up from the working directory on every loader, and a developer's
+    `.env` would leak into the tests' environment. `test_dotenv_loading` installs its
+    own stub on top of this one.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("dspy_profiles.loader.load_dotenv", lambda *args, **kwargs: False)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_typer(runner):
+    """Builds the Typer command tree once up front so CLI tests don't pay for it.
+
+    `run` is resolved as well, since its extra-args context settings take a
+    separate path through Click that the run-command tests would otherwise warm.
+    """
+    for args in (["--help"], ["run", "--help"]):
+        runner.invoke(cli.app, args)
+
+
+@pytest.fixture(scope="session")
+def call_command():
+    """Returns a helper that calls a registered CLI command's callback directly.
+
+    This bypasses Click's argument parsing for tests that only check behaviour,
+    not how the command line is parsed.
+    """
+    callbacks = {info.name: info.callback for info in cli.app.registered_commands}
+
+    def call(name: str, *args, **kwargs):
+        return callbacks[name](*args, **kwargs)
+
+    return call
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """Provides a single `CliRunner` shared by all CLI tests."""
+    return CachedCliRunner()
+
 
 @pytest.fixture(autouse=True)
 def clear_settings():
     """Ensures that the dspy.settings are cleared after each test."""
     yield
-    dspy.settings.configure(**copy.deepcopy(DEFAULT_CONFIG), inherit_config=False)
+    # Top-level lists (e.g. `trace`, `callbacks`) are appended to in place by dspy,
+    # so hand out fresh shallow copies rather than the snapshot's own objects.
+    dspy.settings.configure(
+        **{k: v.copy() if isinstance(v, list) else v for k, v in _PRISTINE_DEFAULT.items()},
+        inherit_config=False,
+    )
+
+
+@pytest.fixture
+def manage_env_var():
+    """Restores `os.environ` after tests that modify it directly."""
+    before = dict(os.environ)
+    yield
+    for key in os.environ.keys() - before.keys():
+        del os.environ[key]
+    for key, value in before.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+
+
+@pytest.fixture(autouse=True)
+def _clear_process_caches():
+    """Keeps process-wide caches from leaking from one test into the next.
+
+    Resolved profiles are cached against real files, `lm()` instances against profile
+    names and retrieval model classes against provider names, so any of them could
+    otherwise serve a stale result to a test that mocks it.
+    """
+    yield
+    _resolve_cached.cache_clear()
+    _LM_CACHE.clear()
+    _rm_class.cache_clear()
 
 
 @pytest.fixture
-def profile_manager():
+def profile_manager(monkeypatch):
     """
     Mocks the ProfileManager to provide a consistent, in-memory dictionary of profiles
     that can be safely manipulated by tests without affecting the filesystem.
@@ -56,11 +264,85 @@ def profile_manager():
     def mock_save(data):
         profiles_copy.update(data)
 
-    with patch("dspy_profiles.loader.ProfileManager") as mock:
-        instance = mock.return_value
-        instance.load.return_value = profiles_copy
-        # Mock the save method to update our in-memory dictionary
-        instance.save = mock_save
-        # Also mock the path attribute to avoid filesystem interactions
-        instance.path = "/tmp/dummy_profiles.toml"
-        yield instance
+    instance = MagicMock(spec=_PROFILE_MANAGER_SPEC)
+    instance.load.return_value = profiles_copy
+    # Mock the save method to update our in-memory dictionary
+    instance.save = mock_save
+    # Also mock the path attribute to avoid filesystem interactions
+    instance.path = "/tmp/dummy_profiles.toml"
+    monkeypatch.setattr("dspy_profiles.loader.ProfileManager", lambda *args, **kwargs: instance)
+    return instance
+
+
+@pytest.fixture(scope="session")
+def composition_profiles_path(tmp_path_factory) -> Path:
+    """Writes `COMPOSITION_PROFILES` to a profiles file shared by the whole session.
+
+    Tests must treat the file as read-only.
+    """
+    path = tmp_path_factory.mktemp("composition") / "profiles.toml"
+    ProfileManager(path).bulk_set(COMPOSITION_PROFILES)
+    return path
+
+
+@pytest.fixture(scope="session")
+def env_file(tmp_path_factory) -> Path:
+    """Writes a `.env` file with `DSPY_`-prefixed and unrelated variables once per session."""
+    path = tmp_path_factory.mktemp("envs") / ".env"
+    path.write_text("DSPY_LM_MODEL=gpt-4o-mini\nDSPY_SETTINGS_TEMPERATURE=0.7\nNOT_DSPY_VAR=x\n")
+    return path
+
+
+@pytest.fixture
+def config_path(request, tmp_path: Path) -> Path:
+    """Provides a per-test `profiles.toml` seeded from `SEEDS` that tests may modify.
+
+    The seed defaults to "default"; pick another via indirect parametrization.
+    """
+    path = tmp_path / "profiles.toml"
+    path.write_bytes(SEEDS[getattr(request, "param", "default")])
+    return path
+
+
+@pytest.fixture
+def mock_profile_manager(monkeypatch):
+    """Replaces `ProfileManager` with an in-memory, dict-backed fake.
+
+    The fake is installed in the API, the `test` command and the profile loader.
+    Every manager instance created while the fixture is active shares the same
+    dictionary, so tests can seed profiles without touching the filesystem.
+    """
+    profiles = {}
+
+    class MockProfileManager:
+        def __init__(self, path: Path):
+            pass
+
+        def load(self):
+            return profiles
+
+        def save(self, data):
+            nonlocal profiles
+            profiles = data
+
+        def get(self, name):
+            return profiles.get(name)
+
+        def set(self, name, config):
+            profiles[name] = config
+
+        def delete(self, name):
+            if name in profiles:
+                del profiles[name]
+                return True
+            return False
+
+    for module in ("dspy_profiles.api", "dspy_profiles.commands.test"):
+        monkeypatch.setattr(f"{module}.ProfileManager", MockProfileManager)
+        monkeypatch.setattr(f"{module}.find_profiles_path", lambda: Path("/fake/path"))
+    monkeypatch.setattr("dspy_profiles.loader.ProfileManager", MockProfileManager)
+
+    # Reset profiles before each test
+    profiles.clear()
+
+    return MockProfileManager
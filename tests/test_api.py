@@ -1,9 +1,5 @@
 """Tests for the core API for managing dspy-profiles."""
 
-from pathlib import Path
-
-import pytest
-
 from dspy_profiles.api import (
     delete_profile,
     get_profile,
@@ -14,43 +10,6 @@ from dspy_profiles.api import (
 )
 
 
-@pytest.fixture
-def mock_profile_manager(monkeypatch):
-    """Fixture to mock the ProfileManager."""
-    profiles = {}
-
-    class MockProfileManager:
-        def __init__(self, path: Path):
-            pass
-
-        def load(self):
-            return profiles
-
-        def save(self, data):
-            nonlocal profiles
-            profiles = data
-
-        def get(self, name):
-            return profiles.get(name)
-
-        def set(self, name, config):
-            profiles[name] = config
-
-        def delete(self, name):
-            if name in profiles:
-                del profiles[name]
-                return True
-            return False
-
-    monkeypatch.setattr("dspy_profiles.api.ProfileManager", MockProfileManager)
-    monkeypatch.setattr("dspy_profiles.api.find_profiles_path", lambda: Path("/fake/path"))
-
-    # Reset profiles before each test
-    profiles.clear()
-
-    return MockProfileManager
-
-
 def test_list_profiles(mock_profile_manager):
     """Test that list_profiles returns the correct data."""
     manager = mock_profile_manager(None)
@@ -145,15 +104,27 @@ def test_update_profile_with_nested_key(mock_profile_manager):
     assert manager.get("default") == expected_profile
 
 
-def test_import_profile(mock_profile_manager, tmp_path):
+def test_import_profile(mock_profile_manager, env_file):
     """Test importing a profile from a .env file."""
-    env_file = tmp_path / ".env"
-    env_file.write_text("DSPY_LM_MODEL=model1\nDSPY_RM_PROVIDER=colbert")
     err = import_profile("imported_prof", env_file)
     assert err is None
 
     manager = mock_profile_manager(None)
-    assert manager.get("imported_prof") is not None
+    assert manager.get("imported_prof") == {
+        "lm": {"model": "gpt-4o-mini"},
+        "settings": {"temperature": "0.7"},
+    }
+
+
+def test_import_profile_multi_word_keys(mock_profile_manager, tmp_path):
+    """Test that only the first separator after DSPY_ splits section from key."""
+    env_path = tmp_path / "multi.env"
+    env_path.write_text("DSPY_LM_API_BASE=http://localhost\ndspy_lm_max_tokens=5\nDSPY_LM=x\n")
+    assert import_profile("multi", env_path) is None
+
+    assert mock_profile_manager(None).get("multi") == {
+        "lm": {"api_base": "http://localhost", "max_tokens": "5"}
+    }
 
 
 def test_validate_profiles_file(tmp_path):
@@ -165,3 +136,12 @@ def test_validate_profiles_file(tmp_path):
     invalid_file = tmp_path / "invalid.toml"
     invalid_file.write_text("this is not toml")
     assert validate_profiles_file(invalid_file) is not None
+
+
+def test_validate_profiles_file_missing_and_empty(tmp_path):
+    """Test that a missing file is reported and an empty file is valid."""
+    assert isinstance(validate_profiles_file(tmp_path / "missing.toml"), FileNotFoundError)
+
+    empty_file = tmp_path / "empty.toml"
+    empty_file.touch()
+    assert validate_profiles_file(empty_file) is None
@@ -1,106 +1,120 @@
-import importlib
+import json
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+import subprocess
+import sys
+import tomllib
 
-import toml
-from typer.testing import CliRunner
+import pytest
+import typer
 
-from dspy_profiles import cli
+from dspy_profiles import api, cli
 
-runner = CliRunner()
-
-
-@patch("dspy_profiles.commands.list.api")
-def test_list_command(mock_api: MagicMock):
-    """Tests the list command by mocking the API layer."""
-    # 1. Test with no profiles
-    mock_api.list_profiles.return_value = {}
-    result = runner.invoke(cli.app, ["list"])
-    assert "No profiles found" in result.stdout
-
-    # 2. Test with a profile
-    mock_profiles = {
-        "test_profile": {
-            "lm": {
-                "model": "gpt-4",
-                "api_key": "sk-1234567890abcdef1234567890abcdef",
-                "api_base": "https://api.openai.com/v1",
-            }
+MOCK_LIST_PROFILES = {
+    "test_profile": {
+        "lm": {
+            "model": "gpt-4",
+            "api_key": "sk-1234567890abcdef1234567890abcdef",
+            "api_base": "https://api.openai.com/v1",
         }
     }
-    mock_api.list_profiles.return_value = mock_profiles
-    result = runner.invoke(cli.app, ["list"])
-    assert "test_profile" in result.stdout
-    assert "gpt-4" in result.stdout
-    assert "sk-1...cdef" in result.stdout
-    assert "https://api.open" in result.stdout
-
-    # 3. Test with --json flag
-    result = runner.invoke(cli.app, ["list", "--json"])
-    assert result.exit_code == 0
-    import json
+}
+
+
+@pytest.mark.parametrize(
+    "profiles, expected",
+    [
+        ({}, ["No profiles found"]),
+        (MOCK_LIST_PROFILES, ["test_profile", "gpt-4", "sk-1...cdef", "https://api.open"]),
+    ],
+    ids=["empty", "populated"],
+)
+def test_list_command(mock_command_api, call_command, capsys, profiles, expected):
+    """Tests the list command by mocking the API layer."""
+    mock_api = mock_command_api("list")
+    mock_api.list_profiles.return_value = profiles
+    call_command("list")
+    out = capsys.readouterr().out
+    for text in expected:
+        assert text in out
+
 
-    assert json.loads(result.stdout) == mock_profiles
+def test_list_command_json(mock_command_api, call_command, capsys):
+    """Tests the --json flag of the list command."""
+    mock_api = mock_command_api("list")
+    mock_api.list_profiles.return_value = MOCK_LIST_PROFILES
+    call_command("list", output_json=True)
+    assert json.loads(capsys.readouterr().out) == MOCK_LIST_PROFILES
 
 
-@patch("dspy_profiles.commands.show.api")
-def test_show_command(mock_api: MagicMock):
+def test_show_command(mock_command_api, call_command, capsys):
     """Tests the show command by mocking the API layer."""
+    mock_api = mock_command_api("show")
     # 1. Test showing an existing profile
     mock_profile_data = {"lm": {"model": "gpt-4"}}
     mock_api.get_profile.return_value = mock_profile_data, None
-    result = runner.invoke(cli.app, ["show", "test_profile"])
-    assert result.exit_code == 0
-    assert "gpt-4" in result.stdout
+    call_command("show", "test_profile")
+    assert "gpt-4" in capsys.readouterr().out
     mock_api.get_profile.assert_called_with("test_profile")
 
-    # 2. Test showing a non-existent profile
-    mock_api.get_profile.return_value = None, "Profile 'nonexistent' not found."
-    result = runner.invoke(cli.app, ["show", "nonexistent"])
-    assert result.exit_code == 1
-    assert "Error: Profile 'nonexistent' not found." in result.stdout
-
-    # 3. Test with --json flag
-    mock_api.get_profile.return_value = mock_profile_data, None
-    result = runner.invoke(cli.app, ["show", "test_profile", "--json"])
-    assert result.exit_code == 0
-    import json
+    # 2. Test with --json flag
+    call_command("show", "test_profile", output_json=True)
+    assert json.loads(capsys.readouterr().out) == mock_profile_data
 
-    assert json.loads(result.stdout) == mock_profile_data
 
-
-@patch("dspy_profiles.commands.delete.api")
-def test_delete_command(mock_api: MagicMock):
+def test_delete_command(mock_command_api, call_command, capsys):
     """Tests the delete command by mocking the API layer."""
+    mock_api = mock_command_api("delete")
     # 1. Test deleting an existing profile
     mock_api.delete_profile.return_value = None
-    result = runner.invoke(cli.app, ["delete", "test_profile", "--force"])
-    assert result.exit_code == 0
-    assert "deleted successfully" in result.stdout
+    call_command("delete", "test_profile", force=True)
+    assert "deleted successfully" in capsys.readouterr().out
     mock_api.delete_profile.assert_called_with("test_profile")
 
-    # 2. Test deleting a non-existent profile
-    mock_api.delete_profile.return_value = "Profile 'nonexistent' not found."
-    result = runner.invoke(cli.app, ["delete", "nonexistent", "--force"])
-    assert result.exit_code == 1
-    assert "Error: Profile 'nonexistent' not found." in result.stdout
-
-    # 3. Test deleting the 'default' profile, which should fail
-    result = runner.invoke(cli.app, ["delete", "default", "--force"])
-    assert result.exit_code == 1
-    assert "cannot be deleted" in result.stdout
-
-
-@patch("dspy_profiles.commands.init.api")
-def test_init_command_interactive(mock_api: MagicMock):
+    # 2. Test deleting the 'default' profile, which should fail
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("delete", "default", force=True)
+    assert exc_info.value.exit_code == 1
+    assert "cannot be deleted" in capsys.readouterr().out
+
+
+NOT_FOUND = "Profile 'nonexistent' not found."
+
+# Pre-encoded answers to the `init` prompts: model, API key, API base
+INIT_INPUT_ALL_VALUES = b"openai/gpt-4o-mini\nsk-my-secret-key\nhttp://localhost:8000\n"
+INIT_INPUT_MODEL_ONLY = b"openai/gpt-4o-mini\n\n\n"
+INIT_INPUT_FORCE = b"new/model\nnew-key\n\n"
+
+
+@pytest.mark.parametrize(
+    "command, api_function, api_result, args, kwargs",
+    [
+        ("show", "get_profile", (None, NOT_FOUND), ["nonexistent"], {}),
+        ("delete", "delete_profile", NOT_FOUND, ["nonexistent"], {"force": True}),
+        ("set", "update_profile", (None, NOT_FOUND), ["nonexistent", "lm.model", "x"], {}),
+    ],
+)
+def test_command_reports_api_error(
+    command, api_function, api_result, args, kwargs, mock_command_api, call_command, capsys
+):
+    """Tests that commands surface errors returned by the API layer."""
+    mock_api = mock_command_api(command)
+    getattr(mock_api, api_function).return_value = api_result
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command(command, *args, **kwargs)
+    assert exc_info.value.exit_code == 1
+    assert f"Error: {NOT_FOUND}" in capsys.readouterr().out
+
+
+def test_init_command_interactive(mock_command_api, runner):
     """Tests the interactive init command by mocking the API layer."""
+    mock_api = mock_command_api("init")
     # Mock get_profile to indicate the profile doesn't exist yet
     mock_api.get_profile.return_value = None, None
 
     result = runner.invoke(
         cli.app,
         ["init", "--profile", "test_profile"],
-        input="openai/gpt-4o-mini\nsk-my-secret-key\nhttp://localhost:8000\n",
+        input=INIT_INPUT_ALL_VALUES,
     )
     assert result.exit_code == 0
     assert "Success!" in result.stdout
@@ -119,15 +133,15 @@ def test_init_command_interactive(mock_api: MagicMock):
     )
 
 
-@patch("dspy_profiles.commands.init.api")
-def test_init_command_no_optional_values(mock_api: MagicMock):
+def test_init_command_no_optional_values(mock_command_api, runner):
     """Tests the init command without providing optional values."""
+    mock_api = mock_command_api("init")
     mock_api.get_profile.return_value = None, None
 
     result = runner.invoke(
         cli.app,
         ["init", "--profile", "test_profile_no_key"],
-        input="openai/gpt-4o-mini\n\n\n",
+        input=INIT_INPUT_MODEL_ONLY,
     )
     assert result.exit_code == 0
     assert "Success!" in result.stdout
@@ -137,22 +151,23 @@ def test_init_command_no_optional_values(mock_api: MagicMock):
     )
 
 
-@patch("dspy_profiles.commands.init.api")
-def test_init_command_force(mock_api: MagicMock):
+def test_init_command_force(mock_command_api, call_command, runner, capsys):
     """Tests the --force option of the init command."""
+    mock_api = mock_command_api("init")
     # Mock get_profile to indicate the profile already exists
     mock_api.get_profile.return_value = {"lm": {"model": "old/model"}}, None
 
-    # Test without --force first
-    result = runner.invoke(cli.app, ["init", "--profile", "test_profile"])
-    assert "already exists" in result.stdout
-    assert result.exit_code == 1
+    # Test without --force first, which fails before prompting for anything
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("init", profile_name="test_profile")
+    assert exc_info.value.exit_code == 1
+    assert "already exists" in capsys.readouterr().out
 
     # Test with --force
     result = runner.invoke(
         cli.app,
         ["init", "--profile", "test_profile", "--force"],
-        input="new/model\nnew-key\n\n",
+        input=INIT_INPUT_FORCE,
     )
     assert result.exit_code == 0
     mock_api.create_profile.assert_called_with(
@@ -160,73 +175,52 @@ def test_init_command_force(mock_api: MagicMock):
     )
 
 
-@patch("dspy_profiles.commands.set.api")
-def test_set_command(mock_api: MagicMock):
+def test_set_command(mock_command_api, call_command, capsys):
     """Tests the set command by mocking the API layer."""
+    mock_api = mock_command_api("set")
     mock_api.update_profile.return_value = (
         {"lm": {"model": "gpt-4o", "temperature": "0.7"}},
         None,
     )
 
-    result = runner.invoke(cli.app, ["set", "new_profile", "lm.model", "gpt-4o"])
-    assert result.exit_code == 0
+    call_command("set", "new_profile", "lm.model", "gpt-4o")
     mock_api.update_profile.assert_called_with("new_profile", "lm.model", "gpt-4o")
 
-    result = runner.invoke(cli.app, ["set", "new_profile", "lm.temperature", "0.7"])
-    assert result.exit_code == 0
+    call_command("set", "new_profile", "lm.temperature", "0.7")
     mock_api.update_profile.assert_called_with("new_profile", "lm.temperature", "0.7")
+    assert "Profile 'new_profile' updated successfully." in capsys.readouterr().out
 
 
-@patch("dspy_profiles.commands.run.subprocess.run")
-def test_run_no_command_provided(mock_subprocess_run: MagicMock):
-    """Tests that the run command exits if no command is provided."""
-    result = runner.invoke(cli.app, ["run", "--profile", "test_profile"])
-    assert "No command provided" in result.stdout
-    assert result.exit_code == 1
-    mock_subprocess_run.assert_not_called()
-
-
-@patch("dspy_profiles.commands.run.subprocess.run")
-def test_run_command_not_found(mock_subprocess_run: MagicMock):
-    """Tests the run command when the executable is not found."""
-    mock_subprocess_run.side_effect = FileNotFoundError
-    result = runner.invoke(
-        cli.app, ["run", "--profile", "test_profile", "--", "nonexistent_command"]
-    )
-    assert "Command not found" in result.stdout
-    assert result.exit_code == 1
+def test_main(monkeypatch):
+    """Tests that the console-script entry point dispatches to the Typer app."""
+    calls = []
+    monkeypatch.setattr(cli, "app", lambda **kwargs: calls.append(kwargs))
+    cli.main()
+    assert calls == [{"prog_name": "dspy-profiles"}]
 
 
-@patch("dspy_profiles.commands.run.subprocess.run")
-def test_run_command_fails(mock_subprocess_run: MagicMock):
-    """Tests the run command when the subprocess fails."""
-    mock_subprocess_run.return_value = MagicMock(returncode=123)
-    result = runner.invoke(cli.app, ["run", "--profile", "test_profile", "--", "failing_command"])
-    assert result.exit_code == 123
-
-
-def test_delete_command_corruption_bug(tmp_path: Path):
+@pytest.mark.integration
+def test_delete_command_corruption_bug(config_path: Path, monkeypatch, call_command):
     """Test that the delete command does not corrupt other profiles."""
-    profiles_file = tmp_path / "profiles.toml"
-    # GIVEN a profiles file with two profiles
-    profiles_content = {
-        "default": {"lm": {"model": "gpt-4"}},
-        "testing": {"lm": {"model": "gpt-3.5-turbo"}},
-    }
-    with open(profiles_file, "w") as f:
-        toml.dump(profiles_content, f)
+    # GIVEN a profiles file with two profiles (seeded by the `config_path` fixture)
 
     # WHEN the delete command is called on one profile
-    importlib.import_module("dspy_profiles.api")
-
     # Temporarily patch find_profiles_path to point to our test file
-    with patch("dspy_profiles.api.find_profiles_path", return_value=profiles_file):
-        runner.invoke(cli.app, ["delete", "default", "--force"])
+    monkeypatch.setattr(api, "find_profiles_path", lambda: config_path)
+    call_command("delete", "testing", force=True)
 
-    # THEN the remaining profile should still be intact in the file
-    with open(profiles_file) as f:
-        remaining_profiles = toml.load(f)
+    # THEN the file is rewritten with only the other profile, intact
+    with open(config_path, "rb") as f:
+        remaining_profiles = tomllib.load(f)
 
-    assert "default" in remaining_profiles
-    assert "testing" in remaining_profiles
-    assert remaining_profiles["testing"] == {"lm": {"model": "gpt-3.5-turbo"}}
+    assert remaining_profiles == {"default": {"lm": {"model": "gpt-4"}}}
+
+
+@pytest.mark.integration
+def test_cli_import_does_not_load_dspy():
+    """Tests that importing the CLI leaves dspy and pydantic unimported until needed."""
+    code = (
+        "import sys, dspy_profiles.cli; "
+        "sys.exit(any(name in sys.modules for name in ('dspy', 'pydantic')))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -1,53 +1,42 @@
-from unittest.mock import MagicMock, patch
-
-from typer.testing import CliRunner
-
-from dspy_profiles import cli
-
-runner = CliRunner()
-
-
-@patch("dspy_profiles.commands.diff.api")
-def test_diff_command(mock_api: MagicMock):
+from pydantic import HttpUrl
+import pytest
+import typer
+
+PROFILE_A = {"lm": {"model": "gpt-4o-mini"}}
+PROFILE_B = {"lm": {"model": "claude-3-opus"}}
+NOT_FOUND = (None, "Profile 'nonexistent' not found.")
+# Built once at import, as every HttpUrl construction runs URL validation
+URL_A = HttpUrl("http://localhost:8080")
+URL_B = HttpUrl("http://localhost:8888")
+
+
+@pytest.mark.parametrize(
+    "api_results, exit_code, expected",
+    [
+        ([(PROFILE_A, None), (PROFILE_B, None)], 0, ["gpt-4o-mini", "claude-3-opus", "+", "-"]),
+        ([(PROFILE_A, None), (dict(PROFILE_A), None)], 0, ["Profiles are identical"]),
+        ([(PROFILE_A, None), NOT_FOUND], 1, ["Error: Profile 'nonexistent' not found."]),
+        ([NOT_FOUND], 1, ["Error: Profile 'nonexistent' not found."]),
+        (
+            [({"lm": {"api_base": URL_A}}, None), ({"lm": {"api_base": URL_B}}, None)],
+            0,
+            ['"api_base": "http://localhost:8080/"', '"api_base": "http://localhost:8888/"'],
+        ),
+    ],
+    ids=["different", "identical", "second-not-found", "first-not-found", "http-url"],
+)
+def test_diff_command(mock_command_api, call_command, capsys, api_results, exit_code, expected):
     """Tests the diff command by mocking the API layer."""
-    profile_a = {"lm": {"model": "gpt-4o-mini"}}
-    profile_b = {"lm": {"model": "claude-3-opus"}}
-    profile_c = {"lm": {"model": "gpt-4o-mini"}}
-
-    # 1. Test diff between different profiles
-    mock_api.get_profile.side_effect = [(profile_a, None), (profile_b, None)]
-    result = runner.invoke(cli.app, ["diff", "profile_a", "profile_b"])
-    assert result.exit_code == 0
-    assert "gpt-4o-mini" in result.stdout
-    assert "claude-3-opus" in result.stdout
-    assert "+" in result.stdout
-    assert "-" in result.stdout
-
-    # 2. Test diff between identical profiles
-    mock_api.get_profile.side_effect = [(profile_a, None), (profile_c, None)]
-    result = runner.invoke(cli.app, ["diff", "profile_a", "profile_c"])
-    assert result.exit_code == 0
-    assert "Profiles are identical" in result.stdout
-
-    # 3. Test diff with a non-existent profile
-    mock_api.get_profile.side_effect = [
-        (profile_a, None),
-        (None, "Profile 'nonexistent' not found."),
-    ]
-    result = runner.invoke(cli.app, ["diff", "profile_a", "nonexistent"])
-    assert result.exit_code == 1
-    assert "Error: Profile 'nonexistent' not found." in result.stdout
-
-
-@patch("dspy_profiles.commands.diff.api")
-def test_diff_command_with_http_url(mock_api: MagicMock):
-    """Tests the diff command with a profile containing an HttpUrl."""
-    mock_api.get_profile.side_effect = [
-        ({"lm": {"api_base": "HttpUrl('http://localhost:8080')"}}, None),
-        ({"lm": {"api_base": "HttpUrl('http://localhost:8888')"}}, None),
-    ]
-
-    result = runner.invoke(cli.app, ["diff", "profile1", "profile2"])
-    assert result.exit_code == 0
-    assert 'api_base": "HttpUrl(\'http://localhost:8080\')"' in result.stdout
-    assert 'api_base": "HttpUrl(\'http://localhost:8888\')"' in result.stdout
+    mock_api = mock_command_api("diff")
+    mock_api.get_profile.side_effect = api_results
+
+    try:
+        call_command("diff", "profile_a", "profile_b")
+    except typer.Exit as e:
+        assert e.exit_code == exit_code
+    else:
+        assert exit_code == 0
+
+    out = capsys.readouterr().out
+    for text in expected:
+        assert text in out
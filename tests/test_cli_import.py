@@ -1,37 +1,27 @@
 from pathlib import Path
-from unittest.mock import MagicMock, patch
 
-from typer.testing import CliRunner
+import pytest
+import typer
 
 from dspy_profiles import cli
 
-runner = CliRunner()
 
-
-@patch("dspy_profiles.commands.import_profile.api")
-def test_import_profile(mock_api: MagicMock, tmp_path: Path):
+def test_import_profile(mock_command_api, env_file: Path, call_command, runner, capsys):
     """Tests the import command by mocking the API layer."""
-    env_file = tmp_path / ".env"
-    env_file.write_text("DSPY_LM_MODEL=gpt-4o-mini")
+    mock_api = mock_command_api("import_profile")
 
     # 1. Test successful import
     mock_api.import_profile.return_value = None
-    result = runner.invoke(
-        cli.app,
-        ["import", "--profile", "imported_profile", "--from", str(env_file)],
-    )
-    assert result.exit_code == 0
-    assert "Success!" in result.stdout
+    call_command("import", "imported_profile", env_file)
+    assert "Success!" in capsys.readouterr().out
     mock_api.import_profile.assert_called_with("imported_profile", env_file)
 
     # 2. Test import when profile already exists
     mock_api.import_profile.return_value = "Profile 'imported_profile' already exists."
-    result = runner.invoke(
-        cli.app,
-        ["import", "--profile", "imported_profile", "--from", str(env_file)],
-    )
-    assert result.exit_code == 1
-    assert "Error: Profile 'imported_profile' already exists." in result.stdout
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("import", "imported_profile", env_file)
+    assert exc_info.value.exit_code == 1
+    assert "Error: Profile 'imported_profile' already exists." in capsys.readouterr().out
 
     # 3. Test import with a non-existent file
     result = runner.invoke(
@@ -40,3 +30,15 @@ def test_import_profile(mock_api: MagicMock, tmp_path: Path):
     )
     assert result.exit_code == 2  # Typer's exit code for file not found
     assert "Invalid value" in result.stderr
+
+
+def test_import_profile_warns_when_no_vars(mock_command_api, env_file: Path, call_command, capsys):
+    """Tests that the import command only warns when the file has no usable variables."""
+    mock_api = mock_command_api("import_profile")
+    mock_api.import_profile.return_value = "No variables with the 'DSPY_' prefix found."
+
+    call_command("import", "imported_profile", env_file)
+
+    out = capsys.readouterr().out
+    assert "Warning: No variables with the 'DSPY_' prefix found." in out
+    assert "Success!" not in out
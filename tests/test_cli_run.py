@@ -1,35 +1,84 @@
 import sys
-from unittest.mock import MagicMock, patch
 
-from typer.testing import CliRunner
+import pytest
 
 from dspy_profiles import cli
-
-runner = CliRunner()
-
-
-@patch("dspy_profiles.commands.run.subprocess.run")
-def test_run_command_success(mock_subprocess_run: MagicMock):
-    """Tests that the run command executes a subprocess with the correct environment."""
-    mock_subprocess_run.return_value.returncode = 0
+from dspy_profiles.commands import run as run_command
+
+
+@pytest.mark.parametrize(
+    "returncode, exc, command, exit_code, message",
+    [
+        (0, None, ["echo", "hello"], 0, None),
+        (123, None, ["some-command"], 123, None),
+        (0, None, [], 1, b"No command provided"),
+        (0, FileNotFoundError, ["nonexistent-command"], 1, b"Command not found"),
+    ],
+    ids=["success", "propagates-exit-code", "no-command", "command-not-found"],
+)
+def test_run_command(fake_run, runner, returncode, exc, command, exit_code, message):
+    """Tests that the run command executes a subprocess with the profile's environment."""
+    fake_run.result.returncode = returncode
+    fake_run.exc = exc
+    args = ["run", "--profile", "test_profile"]
+    if command:
+        args += ["--", *command]
+
+    result = runner.invoke(cli.app, args)
+
+    assert result.exit_code == exit_code
+    if message:
+        assert message in result.stdout_bytes
+
+    if not command:
+        assert fake_run.calls == []
+        return
+
+    # Check the command and environment passed to the subprocess
+    ((call_args, call_kwargs),) = fake_run.calls
+    assert call_args == (command,)
+    assert call_kwargs["env"]["DSPY_PROFILE"] == "test_profile"
+
+
+def test_run_python_script_is_bootstrapped(fake_run, runner):
+    """Tests that Python scripts are wrapped so the profile is activated in-process."""
+    fake_run.result.stdout = "script output\n"
+    fake_run.result.stderr = "script warning\n"
 
     result = runner.invoke(
-        cli.app,
-        ["run", "--profile", "test_profile", "--", "echo", "hello"],
+        cli.app, ["run", "--profile", "test_profile", "--", "python", "my_script.py", "--flag"]
     )
 
     assert result.exit_code == 0
-    mock_subprocess_run.assert_called_once()
-
-    # Check the environment passed to the subprocess
-    call_args, call_kwargs = mock_subprocess_run.call_args
-    assert "env" in call_kwargs
-    env = call_kwargs["env"]
-    assert env["DSPY_PROFILE"] == "test_profile"
-    assert call_args == (["echo", "hello"],)
-
-
-def test_run_command_actually_runs():
+    assert b"script output" in result.stdout_bytes
+    assert b"script warning" in result.stdout_bytes
+    ((call_args, _),) = fake_run.calls
+    executable, flag, bootstrap_code = call_args[0]
+    assert executable == sys.executable
+    assert flag == "-c"
+    assert "with activate_profile('test_profile'):" in bootstrap_code
+    assert "sys.argv = ['my_script.py'] + ['--flag']" in bootstrap_code
+
+
+@pytest.mark.parametrize(
+    "executable, expected",
+    [
+        ("python", True),
+        ("/usr/bin/python", True),
+        ("C:\\Python312\\python.exe", True),
+        ("my_script.py", True),
+        ("echo", False),
+        ("/usr/bin/python3", False),
+        ("pythonic", False),
+    ],
+)
+def test_is_python_command(executable, expected):
+    """Tests which executables are wrapped with the in-process profile bootstrap."""
+    assert run_command._is_python_command(executable) is expected
+
+
+@pytest.mark.integration
+def test_run_command_actually_runs(runner):
     """
     Tests that the run command can actually execute a real command.
     We'll use python to print an env var.
@@ -47,37 +96,27 @@ def test_run_command_actually_runs():
     )
 
     assert result.exit_code == 0
-    assert "real_run_profile" in result.stdout
-
-
-@patch("dspy_profiles.commands.run.subprocess.run")
-def test_run_command_propagates_exit_code(mock_subprocess_run: MagicMock):
-    """Tests that the exit code from the subprocess is propagated."""
-    mock_subprocess_run.return_value.returncode = 123
-
-    result = runner.invoke(
-        cli.app,
-        ["run", "--profile", "test_profile", "--", "some-command"],
-    )
-
-    assert result.exit_code == 123
-
+    assert b"real_run_profile" in result.stdout_bytes
 
-def test_run_no_command_provided():
-    """Tests that the command exits if no command is provided to run."""
-    result = runner.invoke(cli.app, ["run", "--profile", "test_profile"])
 
-    assert result.exit_code == 1
-    assert "No command provided" in result.stdout
+@pytest.mark.parametrize(
+    "args, profile_name, default_message",
+    [
+        (["echo", "ok"], "default", True),
+        (["--profile", "test_profile", "echo", "ok"], "test_profile", False),
+    ],
+    ids=["default-profile", "explicit-profile"],
+)
+def test_dspy_run_app(fake_run, runner, monkeypatch, args, profile_name, default_message):
+    """Tests the standalone `dspy-run` app without spawning the command."""
+    monkeypatch.setattr(sys, "argv", ["dspy-run", *args])
+    fake_run.result.stdout = "ok\n"
 
+    result = runner.invoke(run_command.app, args)
 
-@patch("dspy_profiles.commands.run.subprocess.run", side_effect=FileNotFoundError)
-def test_run_command_not_found(mock_subprocess_run: MagicMock):
-    """Tests that the command exits if the command is not found."""
-    result = runner.invoke(
-        cli.app,
-        ["run", "--profile", "test_profile", "--", "nonexistent-command"],
-    )
-
-    assert result.exit_code == 1
-    assert "Command not found" in result.stdout
+    assert result.exit_code == 0
+    assert b"ok" in result.stdout_bytes
+    assert (b"Using default profile: 'default'" in result.stdout_bytes) is default_message
+    ((call_args, call_kwargs),) = fake_run.calls
+    assert call_args == (["echo", "ok"],)
+    assert call_kwargs["env"]["DSPY_PROFILE"] == profile_name
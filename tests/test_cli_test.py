@@ -1,12 +1,10 @@
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
-from typer.testing import CliRunner
+import pytest
+import typer
 
-from dspy_profiles.cli import app
 from dspy_profiles.loader import ResolvedProfile
 
-runner = CliRunner()
-
 MOCK_PROFILES = {
     "test_profile": {"lm": {"model": "mock-model"}},
     "no_lm_profile": {"rm": {"url": "http://some-rm-url"}},
@@ -23,78 +21,74 @@ def mock_get_config(profile_name):
     )
 
 
-def test_test_command_success():
-    """Test the 'test' command with a profile that should succeed."""
-    mock_manager = MagicMock()
-    mock_manager.get.return_value = MOCK_PROFILES["test_profile"]
-
-    with (
-        patch("dspy_profiles.commands.test.ProfileManager", return_value=mock_manager),
-        patch("dspy_profiles.core.ProfileLoader") as mock_loader,
-    ):
-        mock_loader.return_value.get_config.side_effect = mock_get_config
-
-        with patch("dspy.settings") as mock_settings:
-            mock_lm = MagicMock()
-            mock_lm.return_value = "ok"
-            mock_settings.lm = mock_lm
-
-            result = runner.invoke(app, ["test", "test_profile"])
-
-    assert result.exit_code == 0, result.stdout
-    assert "✅ Success!" in result.stdout
-    mock_lm.assert_called_once_with("Say 'ok'")
-
-
-def test_test_command_failure():
-    """Test the 'test' command with a profile that should fail."""
-    mock_manager = MagicMock()
-    mock_manager.get.return_value = MOCK_PROFILES["test_profile"]
-
-    with (
-        patch("dspy_profiles.commands.test.ProfileManager", return_value=mock_manager),
-        patch("dspy_profiles.core.ProfileLoader") as mock_loader,
-    ):
-        mock_loader.return_value.get_config.side_effect = mock_get_config
-
-        with patch("dspy.settings") as mock_settings:
-            mock_lm = MagicMock()
-            mock_lm.side_effect = ConnectionError("Could not connect")
-            mock_settings.lm = mock_lm
-
-            result = runner.invoke(app, ["test", "test_profile"])
-
-    assert result.exit_code == 1, result.stdout
-    assert "❌ Test Failed" in result.stdout
-    assert "Could not connect" in result.stdout
-
-
-def test_test_command_no_lm():
-    """Test the 'test' command with a profile that has no LM configured."""
-    mock_manager = MagicMock()
-    mock_manager.get.return_value = MOCK_PROFILES["no_lm_profile"]
-
-    with (
-        patch("dspy_profiles.commands.test.ProfileManager", return_value=mock_manager),
-        patch("dspy_profiles.core.ProfileLoader") as mock_loader,
-    ):
-        mock_loader.return_value.get_config.side_effect = mock_get_config
-
-        with patch("dspy.settings") as mock_settings:
-            mock_settings.lm = None
-            result = runner.invoke(app, ["test", "no_lm_profile"])
-
-    assert result.exit_code == 1, result.stdout
-    assert "No language model configured" in result.stdout
-
-
-def test_test_command_profile_not_found():
+class RecordingLM:
+    """A minimal stand-in for a dspy LM that records the prompts it receives."""
+
+    model = "mock-model"
+
+    def __init__(self, ret: str = "ok", exc: Exception | None = None):
+        self.calls = []
+        self.ret = ret
+        self.exc = exc
+
+    def __call__(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        if self.exc:
+            raise self.exc
+        return self.ret
+
+
+@pytest.mark.parametrize(
+    "profile_name, make_lm, exit_code, expected",
+    [
+        ("test_profile", RecordingLM, 0, ["✅ Success!"]),
+        (
+            "test_profile",
+            lambda: RecordingLM(exc=ConnectionError("Could not connect")),
+            1,
+            ["❌ Test Failed", "Could not connect"],
+        ),
+        ("no_lm_profile", lambda: None, 1, ["No language model configured"]),
+    ],
+    ids=["success", "failure", "no-lm"],
+)
+def test_test_command(
+    mock_profile_manager,
+    call_command,
+    capsys,
+    monkeypatch,
+    profile_name,
+    make_lm,
+    exit_code,
+    expected,
+):
+    """Tests the 'test' command against a profile's (mocked) language model."""
+    mock_profile_manager(None).set(profile_name, MOCK_PROFILES[profile_name])
+    mock_lm = make_lm()
+
+    monkeypatch.setattr(
+        "dspy_profiles.core.ProfileLoader",
+        lambda *args, **kwargs: SimpleNamespace(get_config=mock_get_config),
+    )
+    monkeypatch.setattr("dspy.settings", SimpleNamespace(lm=mock_lm))
+    try:
+        call_command("test", profile_name)
+    except typer.Exit as e:
+        assert e.exit_code == exit_code
+    else:
+        assert exit_code == 0
+
+    out = capsys.readouterr().out
+    for text in expected:
+        assert text in out
+    if mock_lm is not None:
+        assert mock_lm.calls == ["Say 'ok'"]
+
+
+def test_test_command_profile_not_found(mock_profile_manager, call_command, capsys):
     """Test the 'test' command with a profile that does not exist."""
-    mock_manager = MagicMock()
-    mock_manager.get.return_value = None
-
-    with patch("dspy_profiles.commands.test.ProfileManager", return_value=mock_manager):
-        result = runner.invoke(app, ["test", "nonexistent_profile"])
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("test", "nonexistent_profile")
 
-    assert result.exit_code == 1
-    assert "Profile 'nonexistent_profile' not found" in result.stdout
+    assert exc_info.value.exit_code == 1
+    assert "Profile 'nonexistent_profile' not found" in capsys.readouterr().out
@@ -6,9 +6,9 @@ from dspy_profiles.core import profile, with_profile
 from dspy_profiles.loader import ProfileLoader
 
 
-def test_simple_inheritance(profile_manager):
+def test_simple_inheritance(composition_profiles_path):
     """Tests that a child profile correctly inherits and overrides from a base profile."""
-    loader = ProfileLoader()
+    loader = ProfileLoader(composition_profiles_path)
     resolved = loader.get_config("child")
 
     assert resolved.name == "child"
@@ -21,9 +21,9 @@ def test_simple_inheritance(profile_manager):
     assert resolved.settings["retries"] == 2  # Inherited
 
 
-def test_multi_level_inheritance(profile_manager):
+def test_multi_level_inheritance(composition_profiles_path):
     """Tests that settings are correctly inherited through multiple levels."""
-    loader = ProfileLoader()
+    loader = ProfileLoader(composition_profiles_path)
     resolved = loader.get_config("grandchild")
 
     assert resolved.name == "grandchild"
@@ -37,19 +37,21 @@ def test_multi_level_inheritance(profile_manager):
     assert resolved.settings["timeout"] == 60  # From 'grandchild'
 
 
-def test_circular_dependency_error(profile_manager):
+def test_circular_dependency_error(composition_profiles_path):
     """Tests that a circular 'extends' reference raises a ValueError."""
-    loader = ProfileLoader()
+    loader = ProfileLoader(composition_profiles_path)
     with pytest.raises(ValueError, match="cannot extend itself"):
         loader.get_config("circular")
 
 
 def test_context_manager_with_inline_overrides(profile_manager):
     """Tests that the profile context manager applies inline overrides."""
-    # This DummyLM will be overridden by the profile context.
-    dspy.settings.configure(lm=DummyLM([{"answer": "Should not be called"}]))
-
-    with profile("child", lm={"temperature": 0.9, "max_tokens": 100}, settings={"retries": 10}):
+    # This DummyLM will be overridden by the profile context. It is set on a local
+    # context rather than globally, so nothing leaks into other tests.
+    with (
+        dspy.context(lm=DummyLM([{"answer": "Should not be called"}])),
+        profile("child", lm={"temperature": 0.9, "max_tokens": 100}, settings={"retries": 10}),
+    ):
         # The LM configured inside the context should be a dspy.LM instance
         # Let's inspect it to ensure our settings were applied.
         configured_lm = dspy.settings.lm
@@ -1,12 +1,23 @@
 from pathlib import Path
 
+import pytest
+
 from dspy_profiles.config import PROFILES_PATH, ProfileManager, find_profiles_path
 
+# What the dotted-key TOML in `test_load_dotted_keys` should load as
+EXPECTED_DOTTED = {
+    "prof1": {"lm": {"model": "model1", "temperature": 0.7}},
+    "prof2": {"lm": {"model": "model2", "temperature": 0.8}},
+}
+
 
-def test_find_profiles_path_hierarchy(tmp_path: Path, monkeypatch):
+def test_find_profiles_path_hierarchy(tmp_path: Path, monkeypatch, capsys):
     """Tests the hierarchical search logic of find_profiles_path."""
-    # 1. Test fallback to global default
+    # 1. Test fallback to global default, which must not print anything
+    # (it would corrupt machine-readable output such as `list --json`)
+    monkeypatch.delenv("DSPY_PROFILES_PATH")
     assert find_profiles_path() == PROFILES_PATH
+    assert capsys.readouterr().out == ""
 
     # 2. Test finding local `profiles.toml`
     project_dir = tmp_path / "project"
@@ -74,6 +85,49 @@ def test_profile_manager_isolated_ops(tmp_path: Path, monkeypatch):
     assert manager4.get("prof1") is None
 
 
+def test_profile_manager_bulk_set(tmp_path: Path):
+    """Tests that bulk_set adds and replaces profiles while keeping the others."""
+    manager = ProfileManager(tmp_path / "profiles.toml")
+    manager.set("keep", {"lm": {"model": "kept"}})
+    manager.set("replace", {"lm": {"model": "old"}})
+
+    manager.bulk_set({"replace": {"lm": {"model": "new"}}, "add": {"lm": {"model": "added"}}})
+
+    assert manager.load() == {
+        "keep": {"lm": {"model": "kept"}},
+        "replace": {"lm": {"model": "new"}},
+        "add": {"lm": {"model": "added"}},
+    }
+
+
+def test_profile_manager_set_appends_new_profiles(tmp_path: Path):
+    """Tests that new profiles are appended and existing ones are rewritten in place."""
+    config_path = tmp_path / "profiles.toml"
+    config_path.write_text('# my profiles\n[prof1]\nlm = { model = "model1" }')
+    manager = ProfileManager(config_path)
+
+    manager.set("prof2", {"lm": {"model": "model2"}, "settings": {"retries": 3}})
+    assert config_path.read_text().startswith("# my profiles\n")
+    assert manager.load() == {
+        "prof1": {"lm": {"model": "model1"}},
+        "prof2": {"lm": {"model": "model2"}, "settings": {"retries": 3}},
+    }
+
+    manager.set("prof1", {"lm": {"model": "updated"}})
+    assert manager.get("prof1") == {"lm": {"model": "updated"}}
+    assert manager.get("prof2") == {"lm": {"model": "model2"}, "settings": {"retries": 3}}
+
+
+def test_profile_manager_set_replaces_corrupt_file(tmp_path: Path):
+    """Tests that setting a profile on an unparsable file replaces its contents."""
+    config_path = tmp_path / "profiles.toml"
+    config_path.write_text("this is not valid toml")
+    manager = ProfileManager(config_path)
+
+    manager.set("prof1", {"lm": {"model": "model1"}})
+    assert manager.load() == {"prof1": {"lm": {"model": "model1"}}}
+
+
 def test_load_corrupt_file(tmp_path: Path):
     """Tests that loading a corrupt TOML file returns an empty dict."""
     config_path = tmp_path / "profiles.toml"
@@ -108,11 +162,21 @@ temperature = 0.8
 """
     config_path.write_text(dotted_key_profile)
     manager = ProfileManager(config_path)
-    profiles = manager.load()
-
-    assert "prof1" in profiles
-    assert "prof2" in profiles
-    assert profiles["prof1"]["lm"]["model"] == "model1"
-    assert profiles["prof1"]["lm"]["temperature"] == 0.7
-    assert profiles["prof2"]["lm"]["model"] == "model2"
-    assert profiles["prof2"]["lm"]["temperature"] == 0.8
+
+    assert manager.load() == EXPECTED_DOTTED
+
+
+def test_load_is_cached_until_the_file_changes(tmp_path: Path, monkeypatch):
+    """Tests that unchanged files are parsed once and edits are picked up."""
+    config_path = tmp_path / "profiles.toml"
+    config_path.write_text('[prof1]\nlm = { model = "model1" }\n')
+    manager = ProfileManager(config_path)
+
+    first = manager.load()
+    first["prof1"]["lm"]["model"] = "mutated"
+    monkeypatch.setattr("dspy_profiles.config.tomllib.load", lambda f: pytest.fail("re-parsed"))
+    assert manager.load()["prof1"]["lm"]["model"] == "model1"
+
+    monkeypatch.undo()
+    config_path.write_text('[prof1]\nlm = { model = "model-two" }\n')
+    assert manager.load()["prof1"]["lm"]["model"] == "model-two"
@@ -1,10 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 import os
+from threading import Event
 
 import dspy
 from dspy.utils import DummyLM
 import pytest
 
-from dspy_profiles.core import _LM_CACHE, current_profile, lm, profile, with_profile
+from dspy_profiles.core import _rm_class, current_profile, lm, profile, with_profile
 
 
 class MyModule(dspy.Module):
@@ -21,17 +23,6 @@ class MyModule(dspy.Module):
         return current_profile()
 
 
-# Fixture to manage environment variables
-@pytest.fixture
-def manage_env_var():
-    original_value = os.environ.get("DSPY_PROFILE")
-    yield
-    if original_value is not None:
-        os.environ["DSPY_PROFILE"] = original_value
-    elif "DSPY_PROFILE" in os.environ:
-        del os.environ["DSPY_PROFILE"]
-
-
 def test_profile_context_manager_activates_profile(profile_manager):
     """Tests that the profile() context manager correctly activates a profile."""
     with profile("test_profile", config_path=profile_manager.path):
@@ -40,21 +31,96 @@ def test_profile_context_manager_activates_profile(profile_manager):
     assert dspy.settings.lm is None
 
 
-def test_dspy_profile_env_var_has_precedence(profile_manager, manage_env_var):
-    """Tests that DSPY_PROFILE environment variable overrides the context manager."""
-    os.environ["DSPY_PROFILE"] = "env_profile"
+def test_profile_context_manager_restores_state_on_error(profile_manager):
+    """Tests that an exception inside profile() propagates and the profile is deactivated."""
+    with pytest.raises(RuntimeError, match="boom"):
+        with profile("test_profile", config_path=profile_manager.path):
+            assert current_profile().name == "test_profile"
+            raise RuntimeError("boom")
+
+    assert current_profile() is None
+    assert dspy.settings.lm is None
+
+
+def test_profile_context_manager_can_be_reentered(profile_manager):
+    """Tests that entering the same profile() object twice restores everything on exit."""
+    cm = profile("test_profile", config_path=profile_manager.path)
+    with cm:
+        with cm:
+            assert current_profile().name == "test_profile"
+        assert dspy.settings.lm.model == "test_model_context"
+
+    assert current_profile() is None
+    assert dspy.settings.lm is None
+
+
+def test_profile_as_decorator(profile_manager):
+    """Tests that the object returned by profile() can decorate a function."""
+
+    @profile("test_profile", config_path=profile_manager.path)
+    def my_function():
+        return current_profile().name, dspy.settings.lm.model
+
+    assert my_function() == ("test_profile", "test_model_context")
+    assert my_function.__name__ == "my_function"
+    assert current_profile() is None
+    assert dspy.settings.lm is None
+
+
+def test_profile_context_manager_in_worker_threads(profile_manager):
+    """Tests that threads can activate their own profiles without touching global settings."""
 
-    # When DSPY_PROFILE is set, calling profile() should load that profile
-    with profile("other_profile", config_path=profile_manager.path):
-        assert dspy.settings.lm.model == "env_model"
+    def run(name):
+        with profile(name, config_path=profile_manager.path):
+            return current_profile().name, dspy.settings.lm.model
 
+    # Entering a profile on the main thread first must not claim dspy.settings for it.
+    with profile("test_profile", config_path=profile_manager.path):
+        pass
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(run, ["test_profile", "forced_profile"]))
+
+    assert results == [("test_profile", "test_model_context"), ("forced_profile", "forced_model")]
+
+
+def test_profile_context_manager_shared_across_threads(profile_manager):
+    """Tests that one profile() object can be entered by two threads that exit out of order."""
+    cm = profile("test_profile", config_path=profile_manager.path)
+    first_entered, second_entered, first_exited = Event(), Event(), Event()
 
-def test_force_overrides_dspy_profile_env_var(profile_manager, manage_env_var):
-    """Tests that force=True in the context manager overrides DSPY_PROFILE."""
+    def first():
+        with cm:
+            first_entered.set()
+            second_entered.wait(5)
+        first_exited.set()
+        return current_profile()
+
+    def second():
+        first_entered.wait(5)
+        with cm:
+            second_entered.set()
+            first_exited.wait(5)
+            name = current_profile().name
+        return name, current_profile()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first_result, second_result = pool.submit(first), pool.submit(second)
+        assert first_result.result() is None
+        assert second_result.result() == ("test_profile", None)
+
+
+@pytest.mark.parametrize(
+    "force, expected_model", [(False, "env_model"), (True, "forced_model")], ids=["env", "force"]
+)
+def test_profile_context_manager_env_var_precedence(
+    profile_manager, manage_env_var, force, expected_model
+):
+    """Tests that DSPY_PROFILE overrides profile() unless force=True is given."""
     os.environ["DSPY_PROFILE"] = "env_profile"
 
-    with profile("forced_profile", force=True, config_path=profile_manager.path):
-        assert dspy.settings.lm.model == "forced_model"
+    with profile("forced_profile", force=force, config_path=profile_manager.path):
+        assert dspy.settings.lm.model == expected_model
 
 
 def test_with_profile_decorator(profile_manager):
@@ -72,26 +138,36 @@ def test_with_profile_decorator(profile_manager):
     assert dspy.settings.lm is None
 
 
-def test_with_profile_decorator_respects_env_var(profile_manager, manage_env_var):
-    """Tests that the @with_profile decorator respects DSPY_PROFILE."""
+@pytest.mark.parametrize(
+    "force, expected_model", [(False, "env_model"), (True, "forced_model")], ids=["env", "force"]
+)
+def test_with_profile_decorator_env_var_precedence(
+    profile_manager, manage_env_var, force, expected_model
+):
+    """Tests that DSPY_PROFILE overrides @with_profile unless force=True is given."""
     os.environ["DSPY_PROFILE"] = "env_profile"
 
-    @with_profile("other_profile", config_path=profile_manager.path)
+    @with_profile("forced_profile", force=force, config_path=profile_manager.path)
     def my_function():
         return dspy.settings.lm.model
 
-    assert my_function() == "env_model"
+    assert my_function() == expected_model
 
 
-def test_with_profile_decorator_force_overrides_env_var(profile_manager, manage_env_var):
-    """Tests that force=True in the decorator overrides DSPY_PROFILE."""
-    os.environ["DSPY_PROFILE"] = "env_profile"
+def test_with_profile_decorator_is_reentrant_and_resets_on_error(profile_manager):
+    """Tests that nested calls of a decorated function each get their own activation."""
 
-    @with_profile("forced_profile", force=True, config_path=profile_manager.path)
-    def my_function():
-        return dspy.settings.lm.model
+    @with_profile("test_profile", config_path=profile_manager.path)
+    def recurse(depth):
+        assert current_profile().name == "test_profile"
+        if depth == 0:
+            raise RuntimeError("bottom")
+        return recurse(depth - 1)
 
-    assert my_function() == "forced_model"
+    with pytest.raises(RuntimeError, match="bottom"):
+        recurse(2)
+
+    assert current_profile() is None
 
 
 def test_current_profile_utility(profile_manager):
@@ -115,9 +191,6 @@ def test_current_profile_utility(profile_manager):
 
 def test_lm_shortcut(profile_manager):
     """Tests the lm() shortcut utility."""
-    # Clear the cache before the test
-    _LM_CACHE.clear()
-
     # # Get a cached instance
     # lm_instance1 = lm("test_profile", config_path=profile_manager.path)
     # assert isinstance(lm_instance1, dspy.LM)
@@ -144,11 +217,25 @@ def test_lm_shortcut(profile_manager):
     assert lm("no_lm_profile", config_path=profile_manager.path) is None
 
 
+def test_lm_shortcut_caches_nested_overrides(profile_manager):
+    """Tests that lm() caches instances whose overrides contain dicts and lists."""
+    first = lm("test_profile", stop=["\n"], extra_body={"a": 1, "b": 2})
+    second = lm("test_profile", extra_body={"b": 2, "a": 1}, stop=["\n"])
+    assert first is second
+    assert first.kwargs["extra_body"] == {"a": 1, "b": 2}
+
+    # Overrides that only differ in their container types must not share an instance
+    as_pairs = lm("test_profile", stop=["\n"], extra_body=[("a", 1), ("b", 2)])
+    assert as_pairs is not first
+    assert as_pairs.kwargs["extra_body"] == [("a", 1), ("b", 2)]
+
+
 def test_profile_aware_caching(profile_manager):
     """Tests that the cache_dir is set correctly based on the profile."""
     with profile("test_profile", config_path=profile_manager.path):
         expected_path = os.path.expanduser("~/.dspy/cache/test_profile")
         assert dspy.settings.cache_dir == expected_path
+        assert current_profile().settings == {"cache_dir": expected_path}
 
     # A profile with a custom cache_dir should use that value
     profile_manager.load.return_value["custom_cache"] = {
@@ -175,6 +262,15 @@ def test_current_profile_with_decorator(profile_manager):
     assert current_profile() is None
 
 
+def test_profile_with_rm_config(profile_manager):
+    """Tests that a profile's RM config is instantiated with the ColBERTv2 default class."""
+    with profile("no_lm_profile", config_path=profile_manager.path):
+        assert isinstance(dspy.settings.rm, dspy.ColBERTv2)
+        assert dspy.settings.rm.url == "http://some-rm-url"
+
+    assert _rm_class("NotADspyRetriever") is dspy.ColBERTv2
+
+
 def test_profile_no_profile_found(profile_manager):
     """Tests that nothing happens when no profile is found."""
     with profile(config_path=profile_manager.path):
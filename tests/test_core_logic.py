@@ -64,3 +64,13 @@ def test_deep_merge_does_not_modify_originals():
     _deep_merge(parent, child)
     assert parent == parent_original
     assert child == child_original
+
+
+def test_deep_merge_deeply_nested_leaves_originals_untouched():
+    """Test merging several nested levels without modifying any nested parent dict."""
+    parent = {"lm": {"kwargs": {"extra": {"a": 1}, "b": 2}}}
+    child = {"lm": {"kwargs": {"extra": {"c": 3}}}}
+    expected = {"lm": {"kwargs": {"extra": {"a": 1, "c": 3}, "b": 2}}}
+    assert _deep_merge(parent, child) == expected
+    assert parent == {"lm": {"kwargs": {"extra": {"a": 1}, "b": 2}}}
+    assert child == {"lm": {"kwargs": {"extra": {"c": 3}}}}
@@ -1,7 +1,6 @@
-from unittest.mock import patch
-
 import pytest
 
+from dspy_profiles.config import ProfileManager
 from dspy_profiles.loader import ProfileLoader
 
 
@@ -16,11 +15,9 @@ def mock_profiles():
     }
 
 
-@patch("dspy_profiles.loader.ProfileManager")
 def test_load_default_profile(mock_profile_manager, mock_profiles):
     """Tests that the 'default' profile is loaded when none is specified."""
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = mock_profiles
+    mock_profile_manager(None).save(mock_profiles)
     loader = ProfileLoader()
     config = loader.get_config()  # No profile name, should fall back to default
     assert config.name == "default"
@@ -28,11 +25,9 @@ def test_load_default_profile(mock_profile_manager, mock_profiles):
     assert config.lm["model"] == "default_model"
 
 
-@patch("dspy_profiles.loader.ProfileManager")
 def test_load_named_profile(mock_profile_manager, mock_profiles):
     """Tests loading a specifically named profile."""
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = mock_profiles
+    mock_profile_manager(None).save(mock_profiles)
     loader = ProfileLoader()
     config = loader.get_config("prod")
     assert config.name == "prod"
@@ -42,12 +37,10 @@ def test_load_named_profile(mock_profile_manager, mock_profiles):
     assert config.settings["track_usage"] is True
 
 
-@patch("dspy_profiles.loader.ProfileManager")
 def test_load_profile_from_env(mock_profile_manager, mock_profiles, monkeypatch):
     """Tests that the profile name is taken from the DSPY_PROFILE env var."""
     monkeypatch.setenv("DSPY_PROFILE", "prod")
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = mock_profiles
+    mock_profile_manager(None).save(mock_profiles)
     loader = ProfileLoader()
     config = loader.get_config()  # No profile name, should use env var
     assert config.name == "prod"
@@ -55,32 +48,46 @@ def test_load_profile_from_env(mock_profile_manager, mock_profiles, monkeypatch)
     assert config.lm["model"] == "prod_model"
 
 
-@patch("dspy_profiles.loader.ProfileManager")
 def test_profile_not_found(mock_profile_manager):
     """Tests that a ValueError is raised for a non-existent profile."""
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = {}
     loader = ProfileLoader()
     with pytest.raises(ValueError, match="Profile 'nonexistent' not found"):
         loader.get_config("nonexistent")
 
 
-@patch("dspy_profiles.loader.ProfileManager")
-@patch("dspy_profiles.loader.load_dotenv")
-def test_dotenv_loading(mock_load_dotenv, mock_profile_manager):
+def test_dotenv_loading(mock_profile_manager, monkeypatch):
     """Tests that load_dotenv is called."""
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = {}
+    calls = []
+    monkeypatch.setattr("dspy_profiles.loader.load_dotenv", lambda: calls.append(()))
     ProfileLoader()
-    mock_load_dotenv.assert_called_once()
+    assert calls == [()]
 
 
-@patch("dspy_profiles.loader.ProfileManager")
 def test_load_default_profile_not_found(mock_profile_manager):
     """Tests that an empty dict is returned when the default profile is not found."""
-    mock_manager_instance = mock_profile_manager.return_value
-    mock_manager_instance.load.return_value = {}
     loader = ProfileLoader()
     config = loader.get_config("default")
     assert config.name == "default"
     assert config.lm is None
+
+
+def test_get_config_is_cached_until_the_file_changes(tmp_path, monkeypatch):
+    """Tests that resolved profiles are reused until the profiles file is modified."""
+    config_path = tmp_path / "profiles.toml"
+    manager = ProfileManager(config_path)
+    manager.bulk_set(
+        {
+            "base": {"lm": {"model": "base_model"}},
+            "child": {"extends": "base", "settings": {"retries": 1}},
+        }
+    )
+    loader = ProfileLoader(config_path)
+
+    first = loader.get_config("child")
+    first.config["lm"]["model"] = "mutated"
+    with monkeypatch.context() as m:
+        m.setattr(ProfileLoader, "_resolve", lambda *args: pytest.fail("re-resolved"))
+        assert loader.get_config("child").lm == {"model": "base_model"}
+
+    manager.set("base", {"lm": {"model": "new_model"}})
+    assert loader.get_config("child").lm == {"model": "new_model"}
@@ -1,59 +1,75 @@
-from dspy_profiles.utils import normalize_config
+import pytest
 
+from dspy_profiles.utils import copy_config, normalize_config
 
-def test_normalize_config_empty():
-    """Test that an empty config remains empty."""
-    assert normalize_config({}) == {}
 
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        ({}, {}),
+        ({"key1": "value1", "key2": 42}, {"key1": "value1", "key2": 42}),
+        ({"lm.model": "gpt-4"}, {"lm": {"model": "gpt-4"}}),
+        (
+            {"lm.model": "gpt-4", "lm.temperature": 0.7},
+            {"lm": {"model": "gpt-4", "temperature": 0.7}},
+        ),
+        (
+            {"lm.model": "gpt-4", "rm.url": "http://localhost:8000", "max_tokens": 100},
+            {"lm": {"model": "gpt-4"}, "rm": {"url": "http://localhost:8000"}, "max_tokens": 100},
+        ),
+        (
+            {"lm": {"model": "gpt-3.5-turbo"}, "lm.temperature": 0.9},
+            {"lm": {"model": "gpt-3.5-turbo", "temperature": 0.9}},
+        ),
+        (
+            {"lm.temperature": 0.9, "lm": {"model": "gpt-3.5-turbo"}},
+            {"lm": {"model": "gpt-3.5-turbo", "temperature": 0.9}},
+        ),
+        (
+            {"profile1": {"lm.model": "gpt-4", "temperature": 0.5}},
+            {"profile1": {"lm": {"model": "gpt-4"}, "temperature": 0.5}},
+        ),
+        ({"a.b.c": 1, "a.b.d": 2}, {"a": {"b": {"c": 1, "d": 2}}}),
+        ({"lm": "x", "lm.model": "y"}, ValueError),
+        ({"lm.model": "y", "lm": "x"}, ValueError),
+    ],
+    ids=[
+        "empty",
+        "no-dots",
+        "simple-dotted-key",
+        "same-parent",
+        "mixed-keys",
+        "dotted-after-table",
+        "dotted-before-table",
+        "nested-value",
+        "multi-level-key",
+        "value-before-table",
+        "table-before-value",
+    ],
+)
+def test_normalize_config(config, expected):
+    """Test that dotted keys are expanded and merged into nested dictionaries.
 
-def test_normalize_config_no_dots():
-    """Test that a config with no dotted keys remains unchanged."""
-    config = {"key1": "value1", "key2": 42}
-    assert normalize_config(config) == config
+    A key that holds both a table and a value is rejected, whichever comes first.
+    """
+    if expected is ValueError:
+        with pytest.raises(ValueError, match="Key 'lm' is set to both a table and a value"):
+            normalize_config(config)
+    else:
+        assert normalize_config(config) == expected
 
 
-def test_normalize_config_simple_dotted_key():
-    """Test expansion of a single dotted key."""
-    config = {"lm.model": "gpt-4"}
-    expected = {"lm": {"model": "gpt-4"}}
-    assert normalize_config(config) == expected
+def test_normalize_config_does_not_modify_input():
+    """Test that the input dictionary and its nested dictionaries are left untouched."""
+    config = {"lm": {"model": "gpt-4"}, "lm.temperature": 0.9}
+    normalize_config(config)
+    assert config == {"lm": {"model": "gpt-4"}, "lm.temperature": 0.9}
 
 
-def test_normalize_config_multiple_dotted_keys_same_parent():
-    """Test expansion of multiple dotted keys under the same parent."""
-    config = {"lm.model": "gpt-4", "lm.temperature": 0.7}
-    expected = {"lm": {"model": "gpt-4", "temperature": 0.7}}
-    assert normalize_config(config) == expected
-
-
-def test_normalize_config_mixed_keys():
-    """Test a mix of dotted and non-dotted keys."""
-    config = {
-        "lm.model": "gpt-4",
-        "rm.url": "http://localhost:8000",
-        "max_tokens": 100,
-    }
-    expected = {
-        "lm": {"model": "gpt-4"},
-        "rm": {"url": "http://localhost:8000"},
-        "max_tokens": 100,
-    }
-    assert normalize_config(config) == expected
-
-
-def test_normalize_config_with_nested_dict():
-    """Test that existing nested dictionaries are handled correctly."""
-    config = {
-        "lm": {"model": "gpt-3.5-turbo"},
-        "lm.temperature": 0.9,
-    }
-    # The implementation merges the dotted key into the existing dictionary.
-    expected = {"lm": {"model": "gpt-3.5-turbo", "temperature": 0.9}}
-    assert normalize_config(config) == expected
-
-
-def test_normalize_config_deeper_nesting_in_value():
-    """Test that nested dictionaries in values are recursively normalized."""
-    config = {"profile1": {"lm.model": "gpt-4", "temperature": 0.5}}
-    expected = {"profile1": {"lm": {"model": "gpt-4"}, "temperature": 0.5}}
-    assert normalize_config(config) == expected
+def test_copy_config_shares_no_containers():
+    """Test that copy_config copies nested dicts and lists but keeps scalars."""
+    config = {"lm": {"model": "gpt-4", "stop": ["\n"]}, "retries": 2}
+    copied = copy_config(config)
+    assert copied == config
+    assert copied["lm"] is not config["lm"]
+    assert copied["lm"]["stop"] is not config["lm"]["stop"]
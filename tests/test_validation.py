@@ -1,17 +1,14 @@
 from pathlib import Path
 
 import pytest
-from typer.testing import CliRunner
+import typer
 
 from dspy_profiles.cli import app
 
-runner = CliRunner()
-
-
-@pytest.fixture
-def valid_profiles_file(tmp_path: Path) -> Path:
-    """Creates a valid profiles.toml file."""
-    content = """
+# The same profiles spelled with inline tables and with dotted keys, which TOML parses to
+# identical data. Validation must accept and reject both spellings alike.
+VALID_PROFILES = {
+    "inline": """
 [default]
 lm = { model = "gpt-4o-mini", api_base = "https://api.openai.com/v1" }
 
@@ -20,16 +17,23 @@ extends = "default"
 lm = { model = "ollama/llama3", api_base = "http://localhost:11434/v1" }
 rm = { model = "colbertv2.0" }
 cache = { enabled = true }
-"""
-    file_path = tmp_path / "profiles.toml"
-    file_path.write_text(content)
-    return file_path
-
+""",
+    "dotted": """
+[default]
+lm.model = "gpt-4o-mini"
+lm.api_base = "https://api.openai.com/v1"
 
-@pytest.fixture
-def invalid_profiles_file(tmp_path: Path) -> Path:
-    """Creates an invalid profiles.toml file."""
-    content = """
+[ollama]
+extends = "default"
+lm.model = "ollama/llama3"
+lm.api_base = "http://localhost:11434/v1"
+rm.model = "colbertv2.0"
+cache.enabled = true
+""",
+}
+
+INVALID_PROFILES = {
+    "inline": """
 [bad_lm]
 lm = { model = 123 }  # Invalid type
 
@@ -39,52 +43,80 @@ rm = { model = false } # Invalid type
 [unknown_toplevel]
 cache = { enabled = true }
 storage = { type = "local" }
-"""
-    file_path = tmp_path / "profiles.toml"
-    file_path.write_text(content)
+""",
+    "dotted": """
+[bad_lm]
+lm.model = 123  # Invalid type
+
+[bad_rm]
+rm.model = false # Invalid type
+
+[unknown_toplevel]
+cache.enabled = true
+storage.type = "local"
+""",
+}
+
+
+@pytest.fixture(scope="module", params=list(VALID_PROFILES))
+def valid_profiles_file(request, tmp_path_factory) -> Path:
+    """Creates a valid profiles.toml file in each TOML spelling."""
+    file_path = tmp_path_factory.mktemp("valid") / "profiles.toml"
+    file_path.write_text(VALID_PROFILES[request.param])
+    return file_path
+
+
+@pytest.fixture(scope="module", params=list(INVALID_PROFILES))
+def invalid_profiles_file(request, tmp_path_factory) -> Path:
+    """Creates an invalid profiles.toml file in each TOML spelling."""
+    file_path = tmp_path_factory.mktemp("invalid") / "profiles.toml"
+    file_path.write_text(INVALID_PROFILES[request.param])
     return file_path
 
 
-@pytest.fixture
-def malformed_toml_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def malformed_toml_file(tmp_path_factory) -> Path:
     """Creates a malformed profiles.toml file."""
     content = """
 [default]
   model = "missing_section"
   is_malformed =
 """
-    file_path = tmp_path / "profiles.toml"
+    file_path = tmp_path_factory.mktemp("malformed") / "profiles.toml"
     file_path.write_text(content)
     return file_path
 
 
-def test_validate_valid_file(valid_profiles_file: Path):
+def test_validate_valid_file(valid_profiles_file: Path, call_command, capsys):
     """Test validation with a valid profiles.toml file."""
-    result = runner.invoke(app, ["validate", "--config", str(valid_profiles_file)])
-    assert result.exit_code == 0
-    assert "✅ Success!" in result.stdout
-    assert "All profiles are valid" in result.stdout
+    call_command("validate", valid_profiles_file)
+    out = capsys.readouterr().out
+    assert "✅ Success!" in out
+    assert "All profiles are valid" in out
 
 
-def test_validate_invalid_file(invalid_profiles_file: Path):
+def test_validate_invalid_file(invalid_profiles_file: Path, call_command, capsys):
     """Test validation with an invalid profiles.toml file."""
-    result = runner.invoke(app, ["validate", "--config", str(invalid_profiles_file)])
-    assert result.exit_code == 1
-    assert "❌ Validation Failed" in result.stdout
-    assert "bad_lm -> lm -> model" in result.stdout
-    assert "Input should be a valid string" in result.stdout
-    assert "bad_rm -> rm -> model" in result.stdout
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("validate", invalid_profiles_file)
+    assert exc_info.value.exit_code == 1
+    out = capsys.readouterr().out
+    assert "❌ Validation Failed" in out
+    assert "bad_lm -> lm -> model" in out
+    assert "Input should be a valid string" in out
+    assert "bad_rm -> rm -> model" in out
 
 
-def test_validate_nonexistent_file():
+def test_validate_nonexistent_file(runner):
     """Test validation with a nonexistent file."""
     result = runner.invoke(app, ["validate", "--config", "nonexistent.toml"])
     assert result.exit_code == 2  # typer exit code for file not found
     assert "does not exist" in result.stderr
 
 
-def test_validate_malformed_toml(malformed_toml_file: Path):
+def test_validate_malformed_toml(malformed_toml_file: Path, call_command, capsys):
     """Test validation with a malformed TOML file."""
-    result = runner.invoke(app, ["validate", "--config", str(malformed_toml_file)])
-    assert result.exit_code == 1
-    assert "Error:" in result.stdout
+    with pytest.raises(typer.Exit) as exc_info:
+        call_command("validate", malformed_toml_file)
+    assert exc_info.value.exit_code == 1
+    assert "Error:" in capsys.readouterr().out